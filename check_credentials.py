@@ -3,39 +3,58 @@
 Script para verificar se as credenciais estão configuradas corretamente
 """
 
+import functools
 import os
-from dotenv import load_dotenv
+import sys
+from compile_env import load_env
+
+# Valores vazios ou de exemplo do .env.example
+PLACEHOLDERS = frozenset({"seu.email@gmail.com", "suaSenhaSegura", ""})
+
+@functools.cache
+def _read_credentials():
+    """Lê credenciais do ambiente; só carrega o .env se o ambiente não as tiver (uma vez por processo)"""
+    if "YOUTUBE_EMAIL" not in os.environ:
+        load_env()
+    return os.environ.get("YOUTUBE_EMAIL", ""), os.environ.get("YOUTUBE_PASSWORD", "")
 
 def check_credentials():
     """Verifica se as credenciais estão configuradas"""
-    load_dotenv()
-    
-    email = os.getenv("YOUTUBE_EMAIL")
-    password = os.getenv("YOUTUBE_PASSWORD")
-    
+    email, password = _read_credentials()
+    return email not in PLACEHOLDERS and password not in PLACEHOLDERS
+
+def report():
+    """Mostra o resultado da verificação de forma detalhada"""
+    email, password = _read_credentials()
+
     print("🔍 Verificando configuração de credenciais...")
     print("-" * 50)
-    
-    if not email or email == "seu.email@gmail.com":
+
+    if email in PLACEHOLDERS:
         print("❌ EMAIL: Não configurado ou usando valor de exemplo")
         return False
     else:
         print(f"✅ EMAIL: {email}")
-    
-    if not password or password == "suaSenhaSegura":
+
+    if password in PLACEHOLDERS:
         print("❌ SENHA: Não configurada ou usando valor de exemplo")
         return False
     else:
         print(f"✅ SENHA: {'*' * len(password)} (configurada)")
-    
+
     print("-" * 50)
     print("✅ Credenciais configuradas corretamente!")
     return True
 
 if __name__ == "__main__":
-    if check_credentials():
+    # Em supervisores/cron (sem TTY) apenas o código de saída importa
+    if not sys.stdout.isatty():
+        sys.exit(0 if check_credentials() else 1)
+
+    if report():
         print("🚀 Pronto para executar a automação!")
     else:
         print("📝 Configure suas credenciais no arquivo .env antes de continuar")
         print("   YOUTUBE_EMAIL=seu_email_real@gmail.com")
         print("   YOUTUBE_PASSWORD=sua_senha_real")
+        sys.exit(1)
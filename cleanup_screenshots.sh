@@ -53,7 +53,7 @@ cleanup_screenshots() {
     fi
     
     # Conta screenshots
-    screenshot_count=$(find "$SCREENSHOT_DIR" -name "*.png" 2>/dev/null | wc -l)
+    screenshot_count=$(find "$SCREENSHOT_DIR" \( -name "*.png" -o -name "*.jpg" \) 2>/dev/null | wc -l)
     
     if [ $screenshot_count -eq 0 ]; then
         print_warning "Nenhum screenshot encontrado"
@@ -67,7 +67,7 @@ cleanup_screenshots() {
         excess=$((screenshot_count - MAX_SCREENSHOTS))
         echo "🗑️  Removendo $excess screenshots mais antigos..."
         
-        find "$SCREENSHOT_DIR" -name "*.png" -type f -printf '%T@ %p
+        find "$SCREENSHOT_DIR" \( -name "*.png" -o -name "*.jpg" \) -type f -printf '%T@ %p
 ' | 
         sort -n | head -$excess | cut -d' ' -f2- | 
         while read file; do
@@ -85,7 +85,7 @@ cleanup_screenshots() {
         echo -n "🗑️  Deseja remover TODOS os screenshots? (s/N): "
         read -r response
         if [[ "$response" =~ ^[sS]$ ]]; then
-            rm -f "$SCREENSHOT_DIR"/*.png 2>/dev/null || true
+            rm -f "$SCREENSHOT_DIR"/*.png "$SCREENSHOT_DIR"/*.jpg 2>/dev/null || true
             print_success "Todos os screenshots removidos"
         fi
     fi
@@ -173,7 +173,7 @@ show_statistics() {
     
     # Screenshots
     if [ -d "$SCREENSHOT_DIR" ]; then
-        screenshot_count=$(find "$SCREENSHOT_DIR" -name "*.png" 2>/dev/null | wc -l)
+        screenshot_count=$(find "$SCREENSHOT_DIR" \( -name "*.png" -o -name "*.jpg" \) 2>/dev/null | wc -l)
         screenshot_size=$(du -sh "$SCREENSHOT_DIR" 2>/dev/null | cut -f1)
         echo "📸 Screenshots: $screenshot_count arquivos ($screenshot_size)"
     fi
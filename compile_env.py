@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compila o arquivo .env em um cache JSON (env_cache.json, ao lado deste módulo)
+
+Os scripts leem o cache por caminho explícito em vez de re-interpretar o .env
+a cada execução, independente do diretório atual ou do sys.path. Se o .env for
+mais novo que o cache, cai no load_dotenv() normal.
+
+ATENÇÃO: o cache guarda os valores do .env (inclusive YOUTUBE_PASSWORD) em
+texto puro, como o próprio .env. É criado com permissão 0600 e está no
+.gitignore - não commitar nem copiar para outras máquinas.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from dotenv import dotenv_values, load_dotenv
+
+BASE_DIR = Path(__file__).parent
+ENV_FILE = BASE_DIR / ".env"
+CACHE_FILE = BASE_DIR / "env_cache.json"
+
+
+def compile_env() -> dict:
+    """Gera env_cache.json com as variáveis do .env (texto puro, permissão 0600)"""
+    values = {key: value for key, value in dotenv_values(ENV_FILE).items() if value is not None}
+
+    fd = os.open(CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(values, f)
+
+    return values
+
+
+def _cache_is_fresh() -> bool:
+    """Cache é válido se o .env não foi modificado depois dele"""
+    try:
+        return os.path.getmtime(ENV_FILE) <= os.path.getmtime(CACHE_FILE)
+    except OSError:
+        return False
+
+
+def _read_cache() -> Optional[dict]:
+    """Lê o cache pelo caminho explícito; conteúdo inesperado invalida o cache"""
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            values = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(values, dict) or not all(
+        isinstance(key, str) and isinstance(value, str) for key, value in values.items()
+    ):
+        return None
+    return values
+
+
+def load_env():
+    """Carrega variáveis do cache compilado ou, se estiver velho/inválido, do .env"""
+    values = _read_cache() if _cache_is_fresh() else None
+
+    if values is not None:
+        # Mesma semântica do load_dotenv: não sobrescreve o ambiente real
+        for key, value in values.items():
+            os.environ.setdefault(key, value)
+    else:
+        load_dotenv(ENV_FILE)
+
+    return os.environ
+
+
+if __name__ == "__main__":
+    env = compile_env()
+    print(f"✅ {CACHE_FILE.name} gerado com {len(env)} variáveis (texto puro - não commitar)")
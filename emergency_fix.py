@@ -7,10 +7,18 @@ Script de emergência para contornar detecção do Google com login manual assis
 
 import asyncio
 import random
+import re
 import os
+import signal
 import sys
+import time
 from pathlib import Path
 
+try:
+    import orjson as _json  # parse mais rápido do payload da sonda stealth
+except ImportError:
+    import json as _json
+
 # Adiciona src ao path para imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
@@ -24,6 +32,27 @@ from src.core.browser_manager import BrowserManager
 from src.automation.login_handler import YouTubeLoginHandler, LoginStrategy, LoginResult
 from src.automation.human_simulator import HumanBehaviorSimulator
 from src.security.credential_manager import CredentialManager
+from src.utils.logger import get_logger
+
+# Sinais de sessão perdida observados nas respostas de rede (só navegações do frame principal;
+# subrecursos como anúncios, googlevideo e pings de analytics devolvem 403 rotineiramente)
+SESSION_LOST_URL = 'accounts.google.com/ServiceLogin'
+SESSION_LOST_STATUS = {401, 403}
+
+# Probes de furtividade agrupados em um único Runtime.evaluate
+STEALTH_PROBE_JS = (
+    "JSON.stringify({wd: navigator.webdriver, ua: navigator.userAgent, "
+    "plugins: navigator.plugins.length})"
+)
+
+# Cache mínimo de cookies de sessão Google reaproveitado entre execuções
+SESSION_COOKIE_NAMES = {'SID', 'HSID', 'SSID'}
+SESSION_COOKIE_PREFIX = '__Secure-'
+SESSION_COOKIE_TTL = 3600  # 1 hora
+
+# Indicadores de detecção - alternância compilada uma vez: um único passe sobre o HTML
+_BOT_INDICATORS = tuple(sys.intern(s) for s in ('bot detected', 'automation detected', 'please verify', 'captcha'))
+_BOT_RE = re.compile('|'.join(map(re.escape, _BOT_INDICATORS)), re.IGNORECASE)
 
 
 class YouTubeStealthAutomator:
@@ -34,59 +63,172 @@ class YouTubeStealthAutomator:
         self.login_handler = None
         self.human_simulator = HumanBehaviorSimulator()
         self.credential_manager = CredentialManager()
+        self.logger = get_logger()
+        self._session_lost = asyncio.Event()
+        self._ctrl_c_event = asyncio.Event()
+        self._cookies_restored = False
+    
+    @property
+    def _cookie_cache_file(self) -> Path:
+        return Path(self.browser_manager.profile_dir) / "session_cookies.json"
+    
+    @staticmethod
+    def _is_session_cookie(name: str) -> bool:
+        return name in SESSION_COOKIE_NAMES or name.startswith(SESSION_COOKIE_PREFIX)
+    
+    @staticmethod
+    def _dump_cookies(path: Path, cookies: list):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = _json.dumps(cookies)
+        path.write_bytes(data.encode() if isinstance(data, str) else data)
+    
+    @classmethod
+    def _load_cookies(cls, path: Path) -> list:
+        """Lê o cache como JSON puro (nunca pickle) e rejeita qualquer coisa fora do formato esperado"""
+        cookies = _json.loads(path.read_bytes())
+        if not isinstance(cookies, list) or not all(
+            isinstance(cookie, dict)
+            and isinstance(cookie.get('name'), str)
+            and isinstance(cookie.get('value'), str)
+            and cls._is_session_cookie(cookie['name'])
+            for cookie in cookies
+        ):
+            raise ValueError("formato inesperado")
+        return cookies
+    
+    async def save_session_cookies(self):
+        """Persiste apenas os cookies de sessão Google (SID, HSID, SSID, __Secure-*)"""
+        try:
+            cookies = await self.browser_manager.page.send(uc.cdp.network.get_cookies())
+            session_cookies = [cookie.to_json() for cookie in cookies if self._is_session_cookie(cookie.name)]
+            await asyncio.to_thread(self._dump_cookies, self._cookie_cache_file, session_cookies)
+        except Exception as e:
+            self.logger.warning(f"⚠️  Não foi possível salvar cookies de sessão: {e}")
+    
+    async def restore_session_cookies(self) -> bool:
+        """Aplica cookies salvos há menos de 1h antes da primeira navegação"""
+        path = self._cookie_cache_file
+        try:
+            if time.time() - path.stat().st_mtime > SESSION_COOKIE_TTL:
+                return False
+            cookies = await asyncio.to_thread(self._load_cookies, path)
+            await self.browser_manager.page.send(uc.cdp.network.set_cookies(
+                cookies=[uc.cdp.network.CookieParam.from_json(cookie) for cookie in cookies]
+            ))
+            self.logger.info(f"🍪 {len(cookies)} cookies de sessão restaurados do cache")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning(f"⚠️  Cache de cookies inválido: {e}")
+            return False
+    
+    def _on_response(self, event):
+        """Handler CDP Network.responseReceived - sinaliza perda de sessão"""
+        # No Chrome o id do frame principal é o próprio id do target da aba
+        if event.type_ != uc.cdp.network.ResourceType.DOCUMENT or \
+                event.frame_id != self.browser_manager.page.target.target_id:
+            return
+        response = event.response
+        if response.status in SESSION_LOST_STATUS or SESSION_LOST_URL in response.url:
+            self._session_lost.set()
+    
+    async def _wait_session_end(self):
+        """Aguarda sessão perdida ou Ctrl+C sem polling"""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._ctrl_c_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C continua chegando como KeyboardInterrupt
+        
+        self.browser_manager.page.add_handler(uc.cdp.network.ResponseReceived, self._on_response)
+        
+        waiters = [
+            asyncio.create_task(self._session_lost.wait()),
+            asyncio.create_task(self._ctrl_c_event.wait())
+        ]
+        try:
+            # O nodriver só habilita o domínio no próximo send; nada mais é enviado nesta aba aqui
+            await self.browser_manager.page.send(uc.cdp.network.enable())
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            self.browser_manager.page.remove_handler(uc.cdp.network.ResponseReceived, self._on_response)
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+        
+        return self._session_lost.is_set()
     
     async def launch_stealth_browser(self):
         """Lança browser com máxima furtividade"""
-        print("🚀 Iniciando browser stealth de emergência...")
+        self.logger.info("🚀 Iniciando browser stealth de emergência...")
         
-        self.browser_manager = BrowserManager(profile_name="emergency_stealth")
+        # Mesmo profile dos outros entrypoints, sem rotação: cache quente e fingerprint estável
+        self.browser_manager = BrowserManager(profile_name="default", logger=self.logger)
         browser, page = await self.browser_manager.launch_stealth_browser(
             headless=False,
-            context_rotation=True
+            context_rotation=False
         )
         
-        self.login_handler = YouTubeLoginHandler(self.browser_manager, self.credential_manager)
+        self.login_handler = YouTubeLoginHandler(
+            self.browser_manager,
+            self.credential_manager,
+            human_simulator=self.human_simulator,
+            logger=self.logger
+        )
+        
+        # Cookies recentes entram antes do primeiro goto
+        self._cookies_restored = await self.restore_session_cookies()
         
-        print("✅ Browser stealth configurado")
+        self.logger.info("✅ Browser stealth configurado")
         return browser, page
     
     async def smart_login_strategy(self):
         """Estratégia inteligente de login - prioriza manual assistido"""
         
-        print("\n🔐 ESTRATÉGIA DE LOGIN INTELIGENTE")
-        print("=" * 50)
-        
-        # Estratégia 1: Verificar sessão existente
-        print("🔄 Verificando sessão existente...")
-        result = await self.login_handler.login(LoginStrategy.SESSION_RESTORE)
+        self.logger.info("🔐 ESTRATÉGIA DE LOGIN INTELIGENTE")
         
-        if result == LoginResult.SUCCESS:
-            print("✅ Login via sessão existente - SUCESSO!")
-            return True
+        # Estratégia 1: Cookies em cache (< 1h) ou sessão existente
+        if self._cookies_restored:
+            self.logger.info("🍪 Verificando sessão dos cookies em cache...")
+            await self.browser_manager.navigate_safely('https://www.youtube.com')
+            if await self.login_handler._is_logged_in():
+                self.logger.info("✅ Login via cookies em cache - SUCESSO!")
+                return True
+        else:
+            self.logger.info("🔄 Verificando sessão existente...")
+            result = await self.login_handler.login(LoginStrategy.SESSION_RESTORE)
+            
+            if result == LoginResult.SUCCESS:
+                self.logger.info("✅ Login via sessão existente - SUCESSO!")
+                return True
         
         # Estratégia 2: Login manual assistido (mais seguro contra detecção)
-        print("\n🛡️  Usando login manual assistido para evitar detecção...")
+        self.logger.info("🛡️  Usando login manual assistido para evitar detecção...")
         result = await self.login_handler.login(LoginStrategy.MANUAL_ASSISTED)
         
         if result == LoginResult.SUCCESS:
-            print("✅ Login manual assistido - SUCESSO!")
+            self.logger.info("✅ Login manual assistido - SUCESSO!")
             return True
         
         # Estratégia 3: Tentativa automática como último recurso
-        print("\n🤖 Tentando login automático como último recurso...")
+        self.logger.info("🤖 Tentando login automático como último recurso...")
         result = await self.login_handler.login(LoginStrategy.AUTOMATIC_LOGIN)
         
         if result == LoginResult.SUCCESS:
-            print("✅ Login automático - SUCESSO!")
+            self.logger.info("✅ Login automático - SUCESSO!")
             return True
         
-        print("❌ Todas as estratégias de login falharam")
+        self.logger.error("❌ Todas as estratégias de login falharam")
         return False
     
     async def simulate_human_browsing(self):
         """Simula navegação humana para estabelecer credibilidade"""
         
-        print("\n🎭 Simulando comportamento humano...")
+        self.logger.info("🎭 Simulando comportamento humano...")
         
         page = self.browser_manager.page
         
@@ -105,7 +247,7 @@ class YouTubeStealthAutomator:
         try:
             trending_element = await page.find('a[title*="Trending"]', timeout=5000)
             if trending_element:
-                print("📈 Navegando para Trending...")
+                self.logger.info("📈 Navegando para Trending...")
                 await self.human_simulator.human_click(page, trending_element)
                 await self.human_simulator.simulate_reading_pause(150)
                 
@@ -114,58 +256,60 @@ class YouTubeStealthAutomator:
                 await page.goto('https://www.youtube.com')
                 
         except Exception as e:
-            print(f"⚠️  Navegação para trending falhou: {e}")
+            self.logger.warning(f"⚠️  Navegação para trending falhou: {e}")
         
-        print("✅ Simulação de comportamento humano concluída")
+        self.logger.info("✅ Simulação de comportamento humano concluída")
     
     async def verify_stealth_status(self):
         """Verifica se o stealth está funcionando"""
         
-        print("\n🛡️  Verificando status de furtividade...")
+        self.logger.info("🛡️  Verificando status de furtividade...")
         
         page = self.browser_manager.page
         
-        # Testa detecção de webdriver
-        webdriver_detected = await page.evaluate('navigator.webdriver')
+        # Uma única ida ao browser para os três probes, em paralelo com o HTML
+        probe_json, page_source = await asyncio.gather(
+            page.evaluate(STEALTH_PROBE_JS),
+            page.content()
+        )
+        probe = _json.loads(probe_json)
         
-        if webdriver_detected:
-            print("⚠️  ALERTA: navigator.webdriver detectado!")
+        # Com AutomationControlled desativado o valor correto é false;
+        # true ou undefined (chave ausente no JSON) denunciam automação/patch
+        if probe.get('wd') is not False:
+            self.logger.warning(f"⚠️  ALERTA: navigator.webdriver = {probe.get('wd', 'undefined')}")
         else:
-            print("✅ navigator.webdriver: não detectado")
+            self.logger.info("✅ navigator.webdriver: false (nativo)")
         
         # Verifica user agent
-        user_agent = await page.evaluate('navigator.userAgent')
+        user_agent = probe['ua']
         if 'HeadlessChrome' in user_agent or 'Automation' in user_agent:
-            print("⚠️  ALERTA: User agent suspeito!")
+            self.logger.warning("⚠️  ALERTA: User agent suspeito!")
         else:
-            print("✅ User agent: aparenta ser normal")
+            self.logger.info("✅ User agent: aparenta ser normal")
         
         # Verifica plugins
-        plugins_count = await page.evaluate('navigator.plugins.length')
-        print(f"🔌 Plugins detectados: {plugins_count}")
+        plugins_count = probe['plugins']
+        self.logger.info(f"🔌 Plugins detectados: {plugins_count}")
         
         # Verifica se está sendo detectado como bot
-        page_source = await page.content()
-        bot_indicators = ['bot detected', 'automation detected', 'please verify', 'captcha']
-        
-        detected_indicators = [indicator for indicator in bot_indicators if indicator.lower() in page_source.lower()]
+        # Uma única varredura case-insensitive, sem copiar o HTML com .lower()
+        found = {match.lower() for match in _BOT_RE.findall(page_source)}
+        detected_indicators = [indicator for indicator in _BOT_INDICATORS if indicator in found]
         
         if detected_indicators:
-            print(f"⚠️  ALERTA: Possível detecção de bot: {detected_indicators}")
+            self.logger.warning(f"⚠️  ALERTA: Possível detecção de bot: {detected_indicators}")
         else:
-            print("✅ Nenhum indicador de detecção de bot encontrado")
+            self.logger.info("✅ Nenhum indicador de detecção de bot encontrado")
         
         return len(detected_indicators) == 0
     
     async def run_emergency_automation(self):
         """Executa automação de emergência completa"""
         
-        print("\n" + "="*60)
-        print("🚨 YOUTUBE STEALTH AUTOMATOR - EMERGÊNCIA")
-        print("="*60)
-        print("🎯 Objetivo: Login seguro evitando detecção do Google")
-        print("🛡️  Estratégia: Máxima furtividade + Login manual assistido")
-        print("="*60)
+        self.logger.info("🚨 YOUTUBE STEALTH AUTOMATOR - EMERGÊNCIA")
+        self.logger.info("🎯 Objetivo: Login seguro evitando detecção do Google")
+        self.logger.info("🛡️  Estratégia: Máxima furtividade + Login manual assistido")
         
         try:
             # 1. Lança browser stealth
@@ -175,41 +319,41 @@ class YouTubeStealthAutomator:
             stealth_ok = await self.verify_stealth_status()
             
             if not stealth_ok:
-                print("⚠️  Stealth pode estar comprometido, mas continuando...")
+                self.logger.warning("⚠️  Stealth pode estar comprometido, mas continuando...")
             
             # 3. Executa login inteligente
             login_success = await self.smart_login_strategy()
             
             if not login_success:
-                print("❌ Falha no login - encerrando")
+                self.logger.error("❌ Falha no login - encerrando")
                 return False
             
+            await self.save_session_cookies()
+            
             # 4. Simula comportamento humano pós-login
             await self.simulate_human_browsing()
             
             # 5. Captura screenshot de confirmação
             screenshot_path = await self.browser_manager.take_screenshot("login_success.png")
             
-            print("\n🎉 AUTOMAÇÃO DE EMERGÊNCIA CONCLUÍDA COM SUCESSO!")
-            print(f"📸 Screenshot salvo: {screenshot_path}")
-            print("\n🔄 O browser permanecerá aberto para uso manual...")
-            print("🔒 Pressione Ctrl+C para encerrar")
+            self.logger.info("🎉 AUTOMAÇÃO DE EMERGÊNCIA CONCLUÍDA COM SUCESSO!")
+            self.logger.info(f"📸 Screenshot salvo: {screenshot_path}")
+            self.logger.info("🔄 O browser permanecerá aberto para uso manual...")
+            self.logger.info("🔒 Pressione Ctrl+C para encerrar")
             
-            # Mantém browser aberto para uso manual
+            # Mantém browser aberto para uso manual (sem polling: aguarda eventos)
             try:
-                while True:
-                    await asyncio.sleep(10)
-                    # Verifica se ainda está logado
-                    if not await self.login_handler._is_logged_in():
-                        print("⚠️  Sessão perdida detectada")
-                        break
+                if await self._wait_session_end():
+                    self.logger.warning("⚠️  Sessão perdida detectada")
+                else:
+                    self.logger.info("🔒 Encerrando por solicitação do usuário...")
             except KeyboardInterrupt:
-                print("\n🔒 Encerrando por solicitação do usuário...")
+                self.logger.info("🔒 Encerrando por solicitação do usuário...")
             
             return True
             
         except Exception as e:
-            print(f"❌ Erro crítico na automação: {e}")
+            self.logger.error(f"❌ Erro crítico na automação: {e}")
             return False
         
         finally:
@@ -232,15 +376,15 @@ async def main():
     automator = YouTubeStealthAutomator()
     success = await automator.run_emergency_automation()
     
+    # Resumo pela mesma fila do logger: print direto sairia antes dos registros pendentes
+    logger = automator.logger
     if success:
-        print("\n✅ Automação de emergência executada com sucesso!")
-        print("🔐 Sessão salva para próximas execuções")
+        logger.info("✅ Automação de emergência executada com sucesso!")
+        logger.info("🔐 Sessão salva para próximas execuções")
     else:
-        print("\n❌ Automação de emergência falhou")
-        print("💡 Dicas:")
-        print("   - Verifique sua conexão com a internet")
-        print("   - Tente executar novamente")
-        print("   - Use VPN se necessário")
+        logger.error("❌ Automação de emergência falhou")
+        logger.info("💡 Dicas: verifique sua conexão com a internet, tente executar novamente "
+                    "ou use VPN se necessário")
 
 
 if __name__ == "__main__":
@@ -250,7 +394,6 @@ if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("\n🔒 Execução interrompida pelo usuário")
+        get_logger().info("🔒 Execução interrompida pelo usuário")
     except Exception as e:
-        print(f"\n❌ Erro fatal: {e}")
-        print("🔧 Verifique as dependências e tente novamente")
+        get_logger().error(f"❌ Erro fatal: {e} - verifique as dependências e tente novamente")
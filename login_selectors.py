@@ -0,0 +1,57 @@
+"""
+Seletores do fluxo de login do Google/YouTube
+
+Tuplas imutáveis montadas uma vez no import; os *_CSS juntam cada tupla num
+único seletor CSS (lista separada por vírgula) que o main.py resolve com um
+só wait_for.
+"""
+
+SIGN_IN_SELECTORS = (
+    "a[aria-label*='Sign in']",
+    "a[aria-label*='Fazer login']",
+    "a[href*='accounts.google.com']",
+    "button[aria-label*='Sign in']",
+    "tp-yt-paper-button[aria-label*='Sign in']",
+    "#sign-in-button",
+    "a[href*='ServiceLogin']",
+)
+
+EMAIL_SELECTORS = (
+    "input[type='email']",
+    "input#identifierId",
+    "input[name='identifier']",
+    "#identifierId",
+    "input[aria-label*='email']",
+)
+
+# Só CSS válido: :contains() não existe fora do jQuery; texto vai por page.find
+NEXT_SELECTORS = (
+    "#identifierNext",
+    "button[jsname='LgbsSe']",
+    "input[type='submit']",
+    "#next",
+    ".VfPpkd-LgbsSe",
+    "button[data-idom-class*='submit']",
+)
+NEXT_BUTTON_TEXTS = ("Next", "Avançar")
+
+PASSWORD_SELECTORS = (
+    "input[type='password']",
+    "input[name='password']",
+    "#password input",
+    "#password",
+    "input[aria-label*='password']",
+    "input[aria-label*='Password']",
+    "input[placeholder*='password']",
+    "input[placeholder*='Password']",
+    "input[autocomplete='current-password']",
+    "input[inputmode='text'][type='password']",
+)
+
+LOGIN_SELECTORS = ("#passwordNext", "button[jsname='LgbsSe']", "input[type='submit']", "#submit")
+
+SIGN_IN_CSS = ", ".join(SIGN_IN_SELECTORS)
+EMAIL_CSS = ", ".join(EMAIL_SELECTORS)
+NEXT_CSS = ", ".join(NEXT_SELECTORS)
+PASSWORD_CSS = ", ".join(PASSWORD_SELECTORS)
+LOGIN_CSS = ", ".join(LOGIN_SELECTORS)
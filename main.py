@@ -1,79 +1,258 @@
-import os, asyncio, random, time
-from dotenv import load_dotenv
+import os, sys, asyncio, random, functools, time, base64, json, itertools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import nodriver as uc
+from compile_env import load_env
+from src.core.stealth_factory import get_browser
+from login_selectors import (
+    SIGN_IN_CSS, EMAIL_CSS, NEXT_CSS, NEXT_BUTTON_TEXTS, PASSWORD_CSS, LOGIN_CSS
+)
 
-# Carrega credenciais (opcionais)
-load_dotenv()
-EMAIL = os.getenv("YOUTUBE_EMAIL")
-PASSWORD = os.getenv("YOUTUBE_PASSWORD")
+# Credenciais (opcionais) - via env_cache.json quando disponível - lidas sob demanda
+@functools.cache
+def _creds():
+    """Carrega o .env uma única vez por processo e retorna (EMAIL, PASSWORD)"""
+    env = load_env()
+    return env.get("YOUTUBE_EMAIL"), env.get("YOUTUBE_PASSWORD")
 
 # Configuração de screenshots temporários
 SCREENSHOT_DIR = "temp_screenshots"
+SCREENSHOT_PATH = Path(SCREENSHOT_DIR)
 SCREENSHOT_LIFETIME = 300  # 5 minutos em segundos
+SCREENSHOT_PATH.mkdir(exist_ok=True)  # uma vez no import, não a cada screenshot
+CLEANUP_INTERVAL = 60  # Verifica a cada minuto, só enquanto houver screenshots
+_cleanup_handle = None
+_cleanup_task = None
+# Nome único por screenshot: id da execução + contador (sem colisão em rajadas)
+_RUN_ID = time.time_ns() // 1_000_000_000
+_shot_counter = itertools.count()
 
-def ensure_screenshot_dir():
-    """Cria diretório de screenshots se não existir"""
-    if not os.path.exists(SCREENSHOT_DIR):
-        os.makedirs(SCREENSHOT_DIR)
+# Bloqueio opcional de assets estáticos (BLOCK_STATIC=1) - o script só lê
+# título, URL e alguns seletores, então imagens/fontes/CSS são trabalho inútil
+STATIC_ASSET_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif",
+    "*.woff", "*.woff2", "*.css", "*.mp4", "*.ts"
+]
 
-def cleanup_old_screenshots():
-    """Remove screenshots antigos para não ocupar armazenamento"""
-    if not os.path.exists(SCREENSHOT_DIR):
+# Sequência de scrolls [(deltaY, pausa_s), ...] seguida de um mousemove e
+# uma pausa final, executada inteira dentro da página
+SCROLL_LOOP_JS = """
+(async (steps, pause) => {
+    for (const [y, dt] of steps) {
+        window.scrollBy(0, y);
+        await new Promise(r => setTimeout(r, dt * 1000));
+    }
+    document.dispatchEvent(new MouseEvent('mousemove', {
+        clientX: Math.random() * window.innerWidth,
+        clientY: Math.random() * window.innerHeight
+    }));
+    await new Promise(r => setTimeout(r, pause * 1000));
+})(%s, %s)
+"""
+
+# Limite de chamadas CDP simultâneas (MAX_CDP_CONCURRENCY, padrão 8) -
+# a aba serializa as consultas no V8 de qualquer forma
+@functools.cache
+def _cdp_sem():
+    """Semáforo criado no primeiro uso, depois do .env já carregado"""
+    return asyncio.Semaphore(int(os.getenv("MAX_CDP_CONCURRENCY", "8")))
+
+async def _q(coro):
+    """Executa uma chamada CDP respeitando o limite de concorrência"""
+    async with _cdp_sem():
+        return await coro
+
+# Threads dedicadas para gravar screenshots sem bloquear o event loop
+_screenshot_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot")
+# Screenshots em andamento - referência forte até concluírem
+_pending_screenshots = set()
+
+# Cookies que indicam sessão Google/YouTube ativa no perfil
+SESSION_COOKIE_NAMES = frozenset({"SAPISID", "SID"})
+
+async def block_static_assets(page):
+    """Bloqueia imagens, fontes e CSS via CDP Network.setBlockedURLs"""
+    if os.getenv("BLOCK_STATIC") != "1":
         return
-    
-    current_time = time.time()
-    for filename in os.listdir(SCREENSHOT_DIR):
-        filepath = os.path.join(SCREENSHOT_DIR, filename)
-        if os.path.isfile(filepath):
-            file_age = current_time - os.path.getctime(filepath)
-            if file_age > SCREENSHOT_LIFETIME:
+    await page.send(uc.cdp.network.enable())
+    await page.send(uc.cdp.network.set_blocked_ur_ls(urls=STATIC_ASSET_PATTERNS))
+
+async def open_page(browser, url, new_tab=False):
+    """Abre URL aplicando o bloqueio de assets antes do carregamento"""
+    if os.getenv("BLOCK_STATIC") != "1":
+        return await browser.get(url, new_tab=new_tab)
+    page = await browser.get("about:blank", new_tab=True) if new_tab else browser.main_tab
+    await block_static_assets(page)
+    await page.get(url)
+    return page
+
+async def wait_for_ready(page, timeout=10.0, from_url=None):
+    """Aguarda readyState 'complete' (e a troca de URL, se from_url) em vez de sleep fixo"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        try:
+            # Após um clique o documento antigo ainda está 'complete': exige URL nova
+            if from_url is None or page.target.url != from_url:
+                if await page.evaluate("document.readyState") == "complete":
+                    return True
+        except Exception:
+            pass  # contexto destruído no meio da navegação
+        await asyncio.sleep(0.1)
+    print(f"⚠️ Página não ficou pronta em {timeout}s, seguindo mesmo assim")
+    return False
+
+async def _wait_loaded(page, timeout=5):
+    """Aguarda Page.loadEventFired (teto de timeout s) em vez de sleep fixo"""
+    fut = asyncio.get_running_loop().create_future()
+
+    def _on_load(event):
+        if not fut.done():
+            fut.set_result(None)
+
+    page.add_handler(uc.cdp.page.LoadEventFired, _on_load)
+    try:
+        # browser.get pode retornar depois do load: readyState cobre essa corrida
+        if await page.evaluate("document.readyState") != "complete":
+            await asyncio.wait_for(fut, timeout)
+    except asyncio.TimeoutError:
+        pass  # página lenta: segue como o sleep fixo seguia
+    finally:
+        page.remove_handler(uc.cdp.page.LoadEventFired, _on_load)
+
+def cleanup_old_screenshots():
+    """Remove screenshots antigos; retorna quantos arquivos ainda restam"""
+    # mtime, não ctime: no Linux o ctime muda com chmod/rename
+    cutoff_ns = time.time_ns() - SCREENSHOT_LIFETIME * 1_000_000_000
+    remaining = 0
+    try:
+        # scandir traz o stat junto com a entrada do diretório
+        with os.scandir(SCREENSHOT_DIR) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.stat().st_mtime_ns >= cutoff_ns:
+                    remaining += 1
+                    continue
                 try:
-                    os.remove(filepath)
-                    print(f"🗑️ Screenshot antigo removido: {filename}")
-                except Exception as e:
-                    print(f"⚠️ Erro ao remover {filename}: {e}")
+                    os.remove(entry.path)
+                    print(f"🗑️ Screenshot antigo removido: {entry.name}")
+                except OSError as e:
+                    remaining += 1
+                    print(f"⚠️ Erro ao remover {entry.name}: {e}")
+    except FileNotFoundError:
+        pass
+    return remaining
+
+async def cleanup_screenshots_async():
+    """Executa a varredura do diretório numa thread, fora do event loop"""
+    return await asyncio.to_thread(cleanup_old_screenshots)
+
+def _arm_cleanup(loop):
+    """Arma o timer de limpeza se ainda não houver um pendente"""
+    global _cleanup_handle
+    if _cleanup_handle is None:
+        _cleanup_handle = loop.call_later(CLEANUP_INTERVAL, _schedule_cleanup, loop)
+
+def _on_cleanup_done(task):
+    """Rearma o timer só enquanto restarem screenshots a expirar"""
+    if not task.cancelled() and task.exception() is None and task.result():
+        _arm_cleanup(task.get_loop())
+
+def _start_cleanup(loop):
+    """Dispara a varredura em background sem empilhar sobre uma ainda em curso"""
+    global _cleanup_task
+    if _cleanup_task is None or _cleanup_task.done():
+        _cleanup_task = loop.create_task(cleanup_screenshots_async())
+        _cleanup_task.add_done_callback(_on_cleanup_done)
+    else:
+        _arm_cleanup(loop)
+
+def _schedule_cleanup(loop):
+    """Callback do timer: sem screenshots vivos o timer não volta a ser armado"""
+    global _cleanup_handle
+    _cleanup_handle = None
+    _start_cleanup(loop)
+
+def _write_screenshot(filepath, data):
+    """Decodifica a imagem (base64) e grava em disco - roda no executor"""
+    filepath.write_bytes(base64.b64decode(data))
 
 async def take_screenshot(page, step_name):
     """Tira screenshot temporário de um passo específico"""
     try:
-        ensure_screenshot_dir()
-        timestamp = int(time.time())
-        filename = f"{step_name}_{timestamp}.png"
-        filepath = os.path.join(SCREENSHOT_DIR, filename)
+        # JPEG por padrão: codifica bem mais rápido e ocupa ~5x menos que PNG
+        # (SCREENSHOT_FORMAT=png para depuração, SCREENSHOT_QUALITY ajusta o JPEG)
+        fmt = os.getenv("SCREENSHOT_FORMAT", "jpeg").lower()
+        quality = int(os.getenv("SCREENSHOT_QUALITY", "60")) if fmt == "jpeg" else None
+        filename = f"{step_name}_{_RUN_ID}_{next(_shot_counter):03d}.{'jpg' if fmt == 'jpeg' else fmt}"
+        filepath = SCREENSHOT_PATH / filename
         
-        await page.save_screenshot(filepath)
+        # Captura só o viewport via CDP e grava o arquivo fora do event loop
+        data = await _q(page.send(uc.cdp.page.capture_screenshot(
+            format_=fmt, quality=quality, capture_beyond_viewport=False
+        )))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_screenshot_writer, _write_screenshot, filepath, data)
+        _arm_cleanup(loop)  # novo arquivo a expirar: garante a limpeza periódica
         print(f"📸 Screenshot salvo: {filename} (será removido em 5 min)")
         
-        # Limpa screenshots antigos
-        cleanup_old_screenshots()
-        
     except Exception as e:
         print(f"⚠️ Erro ao tirar screenshot: {e}")
 
+def schedule_screenshot(page, step_name):
+    """Dispara o screenshot em background para não atrasar a próxima ação"""
+    task = asyncio.create_task(take_screenshot(page, step_name))
+    _pending_screenshots.add(task)
+    task.add_done_callback(_pending_screenshots.discard)
+    return task
+
+def debug_screenshot(page, step_name):
+    """Screenshot de etapa bem-sucedida - só com DEBUG_SCREENSHOTS=1 (erros sempre capturam)"""
+    if os.getenv("DEBUG_SCREENSHOTS", "0") == "1":
+        return schedule_screenshot(page, step_name)
+
+async def _retry(coro_fn, tries=3, base=1.0, factor=2, jitter=0.5, cap=30.0):
+    """Repete coro_fn() em timeouts com backoff exponencial + jitter"""
+    for attempt in range(tries):
+        try:
+            return await coro_fn()
+        except (TimeoutError, asyncio.TimeoutError):
+            if attempt == tries - 1:
+                raise
+            delay = base * factor ** attempt * (1 + random.random() * jitter)
+            await asyncio.sleep(min(delay, cap))  # nunca time.sleep: não bloqueia o loop
+
 async def human_navigation(page):
     """Simula navegação humana básica."""
     try:
-        # Scroll e movimento básico
-        await page.evaluate("window.scrollBy(0, 300)")
-        await asyncio.sleep(random.uniform(1, 2))
-        
-        await page.evaluate("window.scrollBy(0, -150)")
-        await asyncio.sleep(random.uniform(0.5, 1.5))
-        
-        # Movimento do mouse
-        await page.evaluate("""
-            document.dispatchEvent(new MouseEvent('mousemove', {
-                clientX: Math.random() * window.innerWidth,
-                clientY: Math.random() * window.innerHeight
-            }));
-        """)
-        await asyncio.sleep(random.uniform(0.5, 1))
+        # Scroll, movimento do mouse e pausas - agenda calculada aqui,
+        # executada inteira no browser em um único Runtime.evaluate
+        steps = [(300, random.uniform(1, 2)), (-150, random.uniform(0.5, 1.5))]
+        pause = random.uniform(0.5, 1)
+        await page.evaluate(SCROLL_LOOP_JS % (json.dumps(steps), pause), await_promise=True)
         
     except Exception as e:
         print(f"⚠️ Erro na navegação: {e}")
 
-async def human_typing(page, element, text):
-    """Simula digitação humana com validação."""
+CLEAR_ACTIVE_JS = (
+    "document.activeElement.value='';"
+    "document.activeElement.dispatchEvent(new Event('input',{bubbles:true}));"
+)
+
+# Preenche o campo focado pelo setter nativo + eventos input/change; devolve o valor final
+PASTE_ACTIVE_JS = """
+(() => {
+    const el = document.activeElement;
+    Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(el, %s);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return el.value;
+})()
+"""
+
+async def human_typing(page, element, text, mode="pasted"):
+    """Simula digitação humana com validação (mode="pasted" cola o valor via JS)."""
     try:
         if element is None:
             print("❌ Elemento é None")
@@ -81,397 +260,316 @@ async def human_typing(page, element, text):
         
         # Clicar no elemento
         try:
-            click_result = element.click()
-            if asyncio.iscoroutine(click_result):
-                click_result = await click_result
+            await element.click()
         except Exception as click_error:
             print(f"❌ Erro no clique: {click_error}")
             return False
             
         await asyncio.sleep(random.uniform(0.5, 1.0))
         
-        # Limpar campo - método melhorado
+        # Colado: uma única chamada CDP; se o valor não pegar, cai na digitação
+        if mode == "pasted":
+            try:
+                if await page.evaluate(PASTE_ACTIVE_JS % json.dumps(text)) == text:
+                    await asyncio.sleep(random.uniform(0.2, 0.4))
+                    return True
+            except Exception as paste_error:
+                print(f"⚠️ Erro ao colar valor: {paste_error}")
+            print("⚠️ Valor colado não confirmado, digitando...")
+        
+        # Limpar campo focado numa única avaliação JS (antes: cliques, Ctrl+A e 50 backspaces)
         try:
-            # Método 1: Triplo clique para seleção
-            for _ in range(3):
-                click_result = element.click()
-                if asyncio.iscoroutine(click_result):
-                    await click_result
-                await asyncio.sleep(0.1)
-            
-            # Método 2: Ctrl+A para seleção total
-            for _ in range(2):
-                select_result = element.send_keys('\u0001')  # Ctrl+A
-                if asyncio.iscoroutine(select_result):
-                    await select_result
-                await asyncio.sleep(0.1)
-            
-            # Método 3: Backspace extensivo
-            for _ in range(50):
-                backspace_result = element.send_keys('\u0008')  # Backspace
-                if asyncio.iscoroutine(backspace_result):
-                    await backspace_result
-                await asyncio.sleep(0.01)
-                
-            await asyncio.sleep(0.5)
-            
+            await page.evaluate(CLEAR_ACTIVE_JS)
         except Exception as clear_error:
             print(f"⚠️ Erro na limpeza: {clear_error}")
         
-        # Digitar texto
-        for char in text:
-            try:
-                send_result = element.send_keys(char)
-                if asyncio.iscoroutine(send_result):
-                    await send_result
-                await asyncio.sleep(random.uniform(0.05, 0.15))
-            except Exception as char_error:
-                print(f"⚠️ Erro ao digitar '{char}': {char_error}")
-                continue
+        # Digitar em 3-4 rajadas com pausas sorteadas de antemão; cada rajada é um
+        # único Input.insertText (send_keys faria um round-trip CDP por caractere)
+        n_chunks = max(1, min(len(text), random.randint(3, 4)))
+        size = max(1, -(-len(text) // n_chunks))
+        bursts = [(text[i:i + size], random.uniform(0.1, 0.3)) for i in range(0, len(text), size)]
+        try:
+            for chunk, pause in bursts:
+                await page.send(uc.cdp.input_.insert_text(text=chunk))
+                await asyncio.sleep(pause)
+        except Exception as type_error:
+            print(f"❌ Erro ao digitar: {type_error}")
+            return False
         
         return True
     except Exception as e:
         print(f"❌ Erro na digitação: {e}")
         return False
 
-async def wait_and_click(page, selector, timeout=10):
-    """Aguarda elemento aparecer e clica nele"""
+async def first_match(page, css, timeout=5):
+    """Aguarda a união de seletores CSS num único wait_for; retorna o elemento ou None"""
     try:
-        element = await page.wait_for(selector, timeout=timeout)
-        if element:
-            await asyncio.sleep(random.uniform(0.5, 1.5))
-            await element.click()
-            return True
-    except Exception as e:
-        print(f"⚠️ Elemento {selector} não encontrado: {e}")
-    return False
-    """Simula movimentos e ações humanas"""
-    await asyncio.sleep(random.uniform(1, 3))
-    # Simula scroll aleatório
-    for _ in range(random.randint(2, 4)):
-        scroll_y = random.randint(100, 400)
-        await page.evaluate(f"window.scrollBy(0, {scroll_y})")
-        await asyncio.sleep(random.uniform(0.5, 1.0))
+        return await _q(page.wait_for(css, timeout=timeout))
+    except (TimeoutError, asyncio.TimeoutError):
+        return None
 
-async def main():
-    """Função principal de automação stealth"""
-    print("🤖 Iniciando automação stealth do YouTube...")
+async def wait_and_click(page, css, timeout=10):
+    """Aguarda o primeiro elemento da união de seletores e clica nele; retorna o elemento"""
+    element = await first_match(page, css, timeout=timeout)
+    if element is None:
+        print(f"⚠️ Nenhum elemento encontrado: {css}")
+        return None
+    await asyncio.sleep(random.uniform(0.5, 1.5))
+    await element.click()
+    return element
+
+async def _navigate_main_tab(page1):
+    """PASSO 3: navegação humana na aba principal"""
+    print("🧭 PASSO 3: Iniciando navegação humana...")
+    await human_navigation(page1)
     
-    browser = None
+    # Screenshot após navegação
+    debug_screenshot(page1, "03_apos_navegacao")
+    
+    # Verifica URL atual
+    url = page1.target.url
+    print(f"🌐 URL atual: {url}")
+
+async def _open_trending(browser):
+    """PASSOS 4 e 5: abre a aba de trending e navega nela"""
+    print("🔗 PASSO 4: Abrindo nova aba para diversificar navegação...")
+    page2 = await open_page(browser, "https://www.youtube.com/trending", new_tab=True)
+    await _wait_loaded(page2)
+    
+    title2 = await page2.evaluate("document.title")
+    print(f"📄 Segunda aba carregada: {title2}")
+    
+    # Screenshot da segunda aba
+    debug_screenshot(page2, "04_segunda_aba_trending")
+    
+    print("🎯 PASSO 5: Navegação na página de trending...")
+    await human_navigation(page2)
+    
+    # Screenshot final
+    debug_screenshot(page2, "05_navegacao_final")
+    return page2, title2
+
+async def _has_session(browser):
+    """Perfil persistido já tem cookie de sessão do YouTube? Então o login é dispensável"""
     try:
-        # Limpa screenshots antigos no início
-        cleanup_old_screenshots()
-        
-        # Inicia browser stealth com configurações para container
-        print("🔧 Configurando browser stealth...")
-        browser = await uc.start(
-            headless=True,
-            no_sandbox=True,
-            user_data_dir="profile_data",
-            browser_executable_path="/usr/bin/chromium-browser",
-            browser_args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--remote-debugging-port=0",
-                "--disable-background-timer-throttling",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-renderer-backgrounding"
-            ]
-        )
-        print("✅ Browser iniciado com sucesso!")
+        cookies = await browser.cookies.get_all()
+    except Exception as e:
+        print(f"⚠️ Não foi possível ler cookies: {e}")
+        return False
+    return any(
+        cookie.name in SESSION_COOKIE_NAMES and cookie.domain.endswith("youtube.com")
+        for cookie in cookies
+    )
 
-        # PONTO ESSENCIAL 1: Acesso inicial ao YouTube
-        print("🎥 PASSO 1: Acessando YouTube diretamente...")
-        page1 = await browser.get("https://www.youtube.com/")
-        await asyncio.sleep(3)  # Aguarda carregamento
-        
-        title = await page1.evaluate("document.title")
-        print(f"📄 Página carregada: {title}")
-        
-        # Screenshot do acesso inicial
-        await take_screenshot(page1, "01_youtube_inicial")
-        
-        # PONTO ESSENCIAL 2: Processo de Login
-        print("🔐 PASSO 2: Iniciando processo de login...")
-        
-        if not EMAIL or not PASSWORD:
-            print("❌ ERRO: Credenciais não encontradas!")
-            print("📝 Configure suas credenciais no arquivo .env:")
-            print("   YOUTUBE_EMAIL=seu.email@gmail.com")
-            print("   YOUTUBE_PASSWORD=suaSenhaSegura")
-            await take_screenshot(page1, "02_erro_credenciais")
-            return
+async def _login(page1, EMAIL, PASSWORD):
+    """PASSO 2: login pelo Google; False quando o fluxo deve ser abortado"""
+    print("🔐 PASSO 2: Iniciando processo de login...")
+    
+    print(f"👤 Fazendo login com: {EMAIL}")
+    
+    # Procura pelo botão Sign In
+    print("🔍 Procurando botão 'Sign in'...")
+    sign_in_clicked = False
+    
+    # Tenta vários seletores para o botão Sign in
+    sign_in_button = await first_match(page1, SIGN_IN_CSS, timeout=10)
+    if sign_in_button:
+        print("✅ Botão Sign in encontrado")
+        debug_screenshot(page1, "02a_botao_sign_in_encontrado")
         
-        print(f"👤 Fazendo login com: {EMAIL}")
+        youtube_url = page1.target.url
+        await sign_in_button.click()
+        await wait_for_ready(page1, from_url=youtube_url)  # Aguarda redirecionamento
+        sign_in_clicked = True
+    
+    if not sign_in_clicked:
+        print("⚠️ Botão Sign in não encontrado, tentando acesso direto ao Google...")
+        await page1.get("https://accounts.google.com/ServiceLogin?service=youtube")
+        await wait_for_ready(page1)
+    
+    debug_screenshot(page1, "02b_pagina_login_google")
+    
+    # Verifica se estamos na página de login do Google
+    current_url = page1.target.url
+    print(f"🌐 URL atual: {current_url}")
+    
+    if "accounts.google.com" in current_url:
+        print("📧 Inserindo email...")
         
-        # Procura pelo botão Sign In
-        print("🔍 Procurando botão 'Sign in'...")
-        sign_in_clicked = False
+        # Aguarda a página carregar completamente
+        await wait_for_ready(page1)
         
-        # Tenta vários seletores para o botão Sign in
-        sign_in_selectors = [
-            "a[aria-label*='Sign in']",
-            "a[href*='accounts.google.com']",
-            "button[aria-label*='Sign in']",
-            "tp-yt-paper-button[aria-label*='Sign in']",
-            "#sign-in-button",
-            "a[href*='ServiceLogin']"
-        ]
+        # Aguarda e preenche o campo de email
+        email_filled = False
+        email_input = await first_match(page1, EMAIL_CSS, timeout=5)
+        if email_input:
+            print("✅ Campo de email encontrado")
+            
+            # Verificar valor atual
+            try:
+                current_value = await email_input.get_attribute('value')
+                if current_value:
+                    print(f"⚠️ Campo já contém: '{current_value}' - limpando...")
+            except:
+                pass
+            
+            success = await human_typing(page1, email_input, EMAIL)
+            
+            # Validar resultado
+            try:
+                final_value = await email_input.get_attribute('value')
+                if EMAIL in final_value and len(final_value) <= len(EMAIL) + 5:
+                    print("✅ Email digitado corretamente")
+                else:
+                    print(f"⚠️ Email incorreto: '{final_value}'")
+            except:
+                pass
+            
+            email_filled = success
         
-        for selector in sign_in_selectors:
+        if not email_filled:
+            print("❌ Campo de email não encontrado! Tentando aguardar mais...")
+            await wait_for_ready(page1)
+            schedule_screenshot(page1, "02c_debug_pagina_completa")
+            
+            # Tenta novamente com wait mais longo
             try:
-                sign_in_button = await page1.select(selector)
-                if sign_in_button:
-                    print(f"✅ Botão Sign in encontrado: {selector}")
-                    await take_screenshot(page1, "02a_botao_sign_in_encontrado")
-                    
-                    await sign_in_button.click()
-                    await asyncio.sleep(3)  # Aguarda redirecionamento
-                    sign_in_clicked = True
-                    break
+                print("🔍 Tentando buscar qualquer input na página...")
+                email_input = await _retry(lambda: page1.wait_for("input", timeout=10))
+                if email_input:
+                    print("✅ Campo genérico encontrado, tentando usar...")
+                    success = await human_typing(page1, email_input, EMAIL)
+                    if success:
+                        email_filled = True
+                    else:
+                        print("❌ Falha ao digitar no campo genérico")
+                else:
+                    print("❌ Campo genérico também retornou None")
             except Exception as e:
-                continue
-        
-        if not sign_in_clicked:
-            print("⚠️ Botão Sign in não encontrado, tentando acesso direto ao Google...")
-            await page1.get("https://accounts.google.com/ServiceLogin?service=youtube")
-            await asyncio.sleep(3)
+                print(f"❌ Falha definitiva no campo de email: {e}")
+                schedule_screenshot(page1, "02c_erro_campo_email")
+                return False
         
-        await take_screenshot(page1, "02b_pagina_login_google")
+        debug_screenshot(page1, "02d_email_preenchido")
         
-        # Verifica se estamos na página de login do Google
-        current_url = await page1.evaluate("window.location.href")
-        print(f"🌐 URL atual: {current_url}")
+        # Clica em "Next" / "Avançar"
+        print("➡️ Clicando em 'Next'...")
+        next_clicked = False
         
-        if "accounts.google.com" in current_url:
-            print("📧 Inserindo email...")
-            
-            # Aguarda a página carregar completamente
-            await asyncio.sleep(3)
-            
-            # Aguarda e preenche o campo de email
-            email_selectors = [
-                "input[type='email']",
-                "input#identifierId", 
-                "input[name='identifier']",
-                "#identifierId",
-                "input[aria-label*='email']"
-            ]
-            
-            email_filled = False
-            for selector in email_selectors:
-                try:
-                    email_input = await page1.wait_for(selector, timeout=5)
-                    if email_input:
-                        print(f"✅ Campo de email encontrado: {selector}")
-                        
-                        # Verificar valor atual
-                        try:
-                            current_value = await email_input.get_attribute('value')
-                            if current_value:
-                                print(f"⚠️ Campo já contém: '{current_value}' - limpando...")
-                        except:
-                            pass
-                        
-                        success = await human_typing(page1, email_input, EMAIL)
-                        
-                        # Validar resultado
-                        try:
-                            final_value = await email_input.get_attribute('value')
-                            if EMAIL in final_value and len(final_value) <= len(EMAIL) + 5:
-                                print("✅ Email digitado corretamente")
-                            else:
-                                print(f"⚠️ Email incorreto: '{final_value}'")
-                        except:
-                            pass
-                        
-                        if success:
-                            email_filled = True
-                            break
-                    else:
-                        print(f"⚠️ Elemento {selector} retornou None")
-                except Exception as e:
-                    print(f"⚠️ Erro com {selector}: {e}")
-                    continue
-            
-            if not email_filled:
-                print("❌ Campo de email não encontrado! Tentando aguardar mais...")
-                await asyncio.sleep(5)
-                await take_screenshot(page1, "02c_debug_pagina_completa")
-                
-                # Tenta novamente com wait mais longo
+        if await wait_and_click(page1, NEXT_CSS, timeout=3):
+            next_clicked = True
+            print("✅ Botão Next clicado")
+        else:
+            # Última tentativa por texto do botão (substitui os antigos :contains())
+            for text in NEXT_BUTTON_TEXTS:
                 try:
-                    print("🔍 Tentando buscar qualquer input na página...")
-                    email_input = await page1.wait_for("input", timeout=10)
-                    if email_input:
-                        print("✅ Campo genérico encontrado, tentando usar...")
-                        success = await human_typing(page1, email_input, EMAIL)
-                        if success:
-                            email_filled = True
-                        else:
-                            print("❌ Falha ao digitar no campo genérico")
-                    else:
-                        print("❌ Campo genérico também retornou None")
-                except Exception as e:
-                    print(f"❌ Falha definitiva no campo de email: {e}")
-                    await take_screenshot(page1, "02c_erro_campo_email")
-                    return
-            
-            await take_screenshot(page1, "02d_email_preenchido")
-            
-            # Clica em "Next" / "Avançar"
-            print("➡️ Clicando em 'Next'...")
-            next_clicked = False
-            
-            # Lista expandida de seletores para o botão Next
-            next_selectors = [
-                "#identifierNext",
-                "button[jsname='LgbsSe']", 
-                "input[type='submit']",
-                "#next",
-                "button:contains('Next')",
-                "button:contains('Avançar')",
-                ".VfPpkd-LgbsSe",
-                "span:contains('Next')",
-                "div[role='button']:contains('Next')",
-                "button[data-idom-class*='submit']"
-            ]
-            
-            for selector in next_selectors:
-                next_clicked = await wait_and_click(page1, selector, timeout=3)
-                if next_clicked:
-                    print(f"✅ Botão Next clicado: {selector}")
+                    next_button = await page1.find(text, best_match=True, timeout=2)
+                except Exception:
+                    next_button = None
+                if next_button:
+                    await next_button.click()
+                    next_clicked = True
+                    print(f"✅ Botão Next clicado pelo texto: {text}")
                     break
-                    
-            if not next_clicked:
-                print("⚠️ Tentando Enter no campo de email...")
-                try:
-                    if email_input:
-                        enter_result = email_input.send_keys('\r')
-                        if asyncio.iscoroutine(enter_result):
-                            await enter_result
-                        next_clicked = True
-                        print("✅ Enter enviado")
-                except Exception as e:
-                    print(f"⚠️ Erro no Enter: {e}")
-            
-            if next_clicked:
-                await asyncio.sleep(4)  # Aguarda mais tempo para carregar página de senha
-                
-                # Aguarda especificamente pela página de senha aparecer
-                print("⏳ Aguardando página de senha...")
-                for attempt in range(8):
-                    try:
-                        password_check = await page1.select("input[type='password']")
-                        if password_check:
-                            print(f"✅ Página de senha carregada")
-                            break
-                    except:
-                        pass
-                    await asyncio.sleep(1)
-                else:
-                    print("⚠️ Timeout na página de senha")
-                    
-            else:
-                print("❌ Não foi possível avançar para a página de senha")
-                await take_screenshot(page1, "02c_erro_next_button")
                 
-            await take_screenshot(page1, "02e_pagina_senha")
-            
-            # Preenche senha
-            print("🔑 Inserindo senha...")
-            password_selectors = [
-                "input[type='password']",
-                "input[name='password']", 
-                "#password input",
-                "#password",
-                "input[aria-label*='password']",
-                "input[aria-label*='Password']",
-                "input[placeholder*='password']",
-                "input[placeholder*='Password']",
-                "input[autocomplete='current-password']",
-                "input[inputmode='text'][type='password']"
-            ]
-            
-            password_filled = False
-            for selector in password_selectors:
-                try:
-                    password_input = await page1.wait_for(selector, timeout=5)
-                    if password_input:
-                        print(f"✅ Campo de senha encontrado: {selector}")
-                        success = await human_typing(page1, password_input, PASSWORD)
-                        if success:
-                            password_filled = True
-                            break
-                    else:
-                        print(f"⚠️ Elemento de senha {selector} não encontrado")
-                except Exception as e:
-                    print(f"⚠️ Erro com senha {selector}: {e}")
-                    continue
-            
-            if not password_filled:
-                print("❌ Campo de senha não encontrado!")
-                await take_screenshot(page1, "02f_erro_campo_senha")
-                return
-            
-            await take_screenshot(page1, "02g_senha_preenchida")
-            
-            # Clica em "Next" / "Entrar"
-            print("🔐 Finalizando login...")
-            login_clicked = await wait_and_click(page1, "#passwordNext")
-            if not login_clicked:
-                # Tenta outros seletores
-                login_selectors = ["button[jsname='LgbsSe']", "input[type='submit']", "#submit"]
-                for selector in login_selectors:
-                    if await wait_and_click(page1, selector):
-                        break
+        if not next_clicked:
+            print("⚠️ Tentando Enter no campo de email...")
+            try:
+                if email_input:
+                    await email_input.send_keys('\r')
+                    next_clicked = True
+                    print("✅ Enter enviado")
+            except Exception as e:
+                print(f"⚠️ Erro no Enter: {e}")
+        
+        if next_clicked:
+            # O wait_for do campo de senha abaixo já cobre o carregamento
+            await asyncio.sleep(random.uniform(0.5, 1.0))
             
-            # Aguarda redirecionamento para YouTube
-            print("⏳ Aguardando redirecionamento para YouTube...")
-            await asyncio.sleep(5)
+            # Aguarda especificamente pela página de senha aparecer
+            print("⏳ Aguardando página de senha...")
+            try:
+                await page1.wait_for("input[type='password']", timeout=8)
+                print("✅ Página de senha carregada")
+            except (TimeoutError, asyncio.TimeoutError):
+                print("⚠️ Timeout na página de senha")
+                
+        else:
+            print("❌ Não foi possível avançar para a página de senha")
+            schedule_screenshot(page1, "02c_erro_next_button")
             
-            # Verifica se o login foi bem-sucedido
-            final_url = await page1.evaluate("window.location.href")
-            if "youtube.com" in final_url:
-                print("✅ Login realizado com sucesso!")
-                await take_screenshot(page1, "02h_login_sucesso")
-            else:
-                print(f"⚠️ Possível problema no login. URL atual: {final_url}")
-                await take_screenshot(page1, "02i_login_problema")
+        debug_screenshot(page1, "02e_pagina_senha")
         
-        else:
-            print("❌ Não foi possível acessar a página de login do Google")
-            await take_screenshot(page1, "02j_erro_acesso_google")
-
-        # PONTO ESSENCIAL 3: Navegação e interação
-        print("🧭 PASSO 3: Iniciando navegação humana...")
-        await human_navigation(page1)
+        # Preenche senha
+        print("🔑 Inserindo senha...")
+        password_filled = False
+        password_input = await first_match(page1, PASSWORD_CSS, timeout=5)
+        if password_input:
+            print("✅ Campo de senha encontrado")
+            password_filled = await human_typing(page1, password_input, PASSWORD)
+        
+        if not password_filled:
+            print("❌ Campo de senha não encontrado!")
+            schedule_screenshot(page1, "02f_erro_campo_senha")
+            return False
         
-        # Screenshot após navegação
-        await take_screenshot(page1, "03_apos_navegacao")
+        debug_screenshot(page1, "02g_senha_preenchida")
         
-        # Verifica URL atual
-        url = await page1.evaluate("window.location.href")
-        print(f"🌐 URL atual: {url}")
-
-        # PONTO ESSENCIAL 4: Abertura de segunda aba
-        print("🔗 PASSO 4: Abrindo nova aba para diversificar navegação...")
-        page2 = await browser.get("https://www.youtube.com/trending", new_tab=True)
-        await asyncio.sleep(2)
+        # Clica em "Next" / "Entrar"
+        print("🔐 Finalizando login...")
+        login_url = page1.target.url
+        await wait_and_click(page1, LOGIN_CSS)
+        
+        # Aguarda redirecionamento para YouTube
+        print("⏳ Aguardando redirecionamento para YouTube...")
+        await wait_for_ready(page1, timeout=15, from_url=login_url)
+        
+        # Verifica se o login foi bem-sucedido
+        final_url = page1.target.url
+        if "youtube.com" in final_url:
+            print("✅ Login realizado com sucesso!")
+            debug_screenshot(page1, "02h_login_sucesso")
+        else:
+            print(f"⚠️ Possível problema no login. URL atual: {final_url}")
+            schedule_screenshot(page1, "02i_login_problema")
+    
+    else:
+        print("❌ Não foi possível acessar a página de login do Google")
+        schedule_screenshot(page1, "02j_erro_acesso_google")
+    
+    return True
+
+async def run_once(browser, EMAIL, PASSWORD):
+    """Executa um job completo (PASSOS 1-6) num browser já iniciado"""
+    page1 = None
+    try:
+        # PONTO ESSENCIAL 1: Acesso inicial ao YouTube
+        print("🎥 PASSO 1: Acessando YouTube diretamente...")
+        page1 = await open_page(browser, "https://www.youtube.com/")
+        # Shell do app pronto basta aqui - não precisa esperar o load de todos os assets
+        try:
+            await page1.wait_for("ytd-app", timeout=15)
+        except (TimeoutError, asyncio.TimeoutError):
+            print("⚠️ ytd-app não apareceu em 15s, seguindo mesmo assim")
         
-        title2 = await page2.evaluate("document.title")
-        print(f"📄 Segunda aba carregada: {title2}")
+        title = await page1.evaluate("document.title")
+        print(f"📄 Página carregada: {title}")
         
-        # Screenshot da segunda aba
-        await take_screenshot(page2, "04_segunda_aba_trending")
+        # Screenshot do acesso inicial
+        debug_screenshot(page1, "01_youtube_inicial")
         
-        # PONTO ESSENCIAL 5: Navegação na segunda aba
-        print("🎯 PASSO 5: Navegação na página de trending...")
-        await human_navigation(page2)
+        # PONTO ESSENCIAL 2: Processo de Login (pulado se o perfil já tem sessão)
+        if await _has_session(browser):
+            print("✅ Sessão do YouTube encontrada no perfil - pulando login")
+        elif not await _login(page1, EMAIL, PASSWORD):
+            return
         
-        # Screenshot final
-        await take_screenshot(page2, "05_navegacao_final")
+        # PONTOS ESSENCIAIS 3-5: as duas abas não compartilham estado,
+        # então navegam em paralelo
+        (page2, title2), _ = await asyncio.gather(
+            _open_trending(browser),
+            _navigate_main_tab(page1)
+        )
 
         # PONTO ESSENCIAL 6: Finalização
         print("✅ PASSO 6: Automação executada com sucesso!")
@@ -481,34 +579,79 @@ async def main():
         print(f"   - Screenshots salvos em: {SCREENSHOT_DIR}")
         print("⏳ Aguardando 3 segundos antes de finalizar...")
         await asyncio.sleep(3)
+        await page2.close()  # no modo serviço as abas não podem se acumular
         
     except Exception as e:
         print(f"❌ Erro durante a execução: {e}")
         # Screenshot do erro se possível
-        try:
-            if 'page1' in locals():
-                await take_screenshot(page1, "erro_execucao")
-        except:
-            pass
+        if page1 is not None:
+            schedule_screenshot(page1, "erro_execucao")
+
+async def _serve(browser, EMAIL, PASSWORD):
+    """Modo serviço: mantém o browser vivo e executa um job por linha do stdin"""
+    print("🔁 Modo serviço: ENTER executa um job, 'q' ou EOF encerra")
+    job = 0
+    while True:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line or line.strip().lower() == "q":
+            break
+        job += 1
+        print(f"▶️ Job {job}")
+        await run_once(browser, EMAIL, PASSWORD)
+
+async def main(serve=False):
+    """Função principal de automação stealth (serve=True reaproveita o browser entre jobs)"""
+    EMAIL, PASSWORD = _creds()
+    print("🤖 Iniciando automação stealth do YouTube...")
+    
+    # Falha rápido: não vale subir o Chromium se o login não pode acontecer
+    if not EMAIL or not PASSWORD:
+        print("❌ ERRO: Credenciais não encontradas!")
+        print("📝 Configure suas credenciais no arquivo .env:")
+        print("   YOUTUBE_EMAIL=seu.email@gmail.com")
+        print("   YOUTUBE_PASSWORD=suaSenhaSegura")
+        return
+    
+    browser = None
+    # Limpeza via timer do loop, armado pelos próprios screenshots
+    global _cleanup_handle
+    loop = asyncio.get_running_loop()
+    try:
+        # Limpa screenshots antigos no início, em paralelo com a subida do browser
+        _start_cleanup(loop)
+        
+        # Inicia browser stealth com configurações para container
+        print("🔧 Configurando browser stealth...")
+        browser = await get_browser("default", headless=True)
+        print("✅ Browser iniciado com sucesso!")
+
+        if serve:
+            await _serve(browser, EMAIL, PASSWORD)
+        else:
+            await run_once(browser, EMAIL, PASSWORD)
+        
+    except Exception as e:
+        print(f"❌ Erro durante a execução: {e}")
     
     finally:
         print("🔚 Finalizando automação...")
+        # Screenshots pendentes precisam do browser vivo
+        await asyncio.gather(*_pending_screenshots, return_exceptions=True)
+        # Passo final de limpeza ainda dentro do loop (o README promete início e fim)
+        if _cleanup_task is not None and not _cleanup_task.done():
+            await _cleanup_task
+        await cleanup_screenshots_async()
+        # Só agora: screenshots e a varredura acima ainda podem rearmar o timer
+        if _cleanup_handle is not None:
+            _cleanup_handle.cancel()
+            _cleanup_handle = None
         if browser:
             try:
                 browser.stop()
             except:
                 pass
 
-async def cleanup_task():
-    """Tarefa assíncrona para limpeza periódica de screenshots"""
-    while True:
-        await asyncio.sleep(60)  # Verifica a cada minuto
-        cleanup_old_screenshots()
-
 if __name__ == "__main__":
-    # Executa automação principal
-    asyncio.run(main())
-    
-    # Limpa screenshots após execução
-    print("🧹 Limpeza final de screenshots...")
-    cleanup_old_screenshots()
+    # Executa automação principal (limpeza roda em background via _schedule_cleanup)
+    # --serve: mantém o Chromium aberto e executa um job por linha do stdin
+    asyncio.run(main(serve="--serve" in sys.argv))
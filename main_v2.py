@@ -6,16 +6,18 @@ Sistema profissional de automação YouTube com arquitetura modular e stealth av
 """
 
 import asyncio
+import signal
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 
 # Adiciona src ao path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+# Browser/login (nodriver) são importados sob demanda: --help, --setup e
+# --credentials não pagam o custo de carregá-los
 try:
-    from src.core.browser_manager import BrowserManager
-    from src.automation.login_handler import YouTubeLoginHandler, LoginStrategy
     from src.automation.human_simulator import HumanBehaviorSimulator
     from src.security.credential_manager import CredentialManager
     from src.utils.logger import get_logger, LogLevel
@@ -26,12 +28,47 @@ except ImportError as e:
     sys.exit(1)
 
 
+def _require_nodriver():
+    """Verifica a dependência crítica só quando o browser vai ser usado"""
+    try:
+        import nodriver  # noqa: F401
+    except ImportError:
+        print("❌ Dependência crítica não encontrada!")
+        print("📦 Execute: pip install -r requirements.txt")
+        sys.exit(1)
+
+
+async def _wait_until_stopped(browser_manager) -> str:
+    """Aguarda Ctrl+C (SIGINT) ou o fim do browser, sem polling; retorna o motivo"""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+    except NotImplementedError:
+        pass  # Windows: Ctrl+C segue chegando como KeyboardInterrupt
+    
+    closed = asyncio.create_task(browser_manager.wait_until_closed())
+    stopped = asyncio.create_task(stop.wait())
+    try:
+        done, _ = await asyncio.wait({closed, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        return closed.result() if closed in done else "interrupted"
+    finally:
+        closed.cancel()
+        stopped.cancel()
+        try:
+            loop.remove_signal_handler(signal.SIGINT)
+        except NotImplementedError:
+            pass
+
+
 class YouTubeAutomationApp:
     """Aplicação principal de automação YouTube"""
     
-    def __init__(self, profile: str = "default", headless: bool = False):
+    def __init__(self, profile: str = "default", headless: bool = False,
+                 connect: Optional[str] = None):
         self.profile = profile
         self.headless = headless
+        self.connect = connect  # host:port do daemon ("" = ler ENDPOINT_FILE)
         
         # Configura logging
         self.logger = get_logger("yt_automation")
@@ -44,25 +81,37 @@ class YouTubeAutomationApp:
         self.login_handler = None
         self.human_simulator = HumanBehaviorSimulator()
         self.credential_manager = CredentialManager()
+        # Screenshots em background: o disco não segura a próxima etapa
+        self._pending_screenshots = set()
     
     async def initialize(self):
         """Inicializa a aplicação"""
         self.logger.info("🚀 Inicializando YouTube Automation v2.0")
         
+        _require_nodriver()
+        from src.core.browser_manager import BrowserManager
+        from src.automation.login_handler import YouTubeLoginHandler
+        
         try:
             # Configura browser manager
-            self.browser_manager = BrowserManager(profile_name=self.profile)
+            self.browser_manager = BrowserManager(profile_name=self.profile, logger=self.logger)
             
-            # Lança browser stealth
-            browser, page = await self.browser_manager.launch_stealth_browser(
-                headless=self.headless,
-                context_rotation=self.config.browser.context_rotation
-            )
+            # Reaproveita o browser do daemon ou lança um novo
+            if self.connect is not None:
+                browser, page = await self.browser_manager.attach(self.connect)
+            else:
+                browser, page = await self.browser_manager.launch_stealth_browser(
+                    headless=self.headless,
+                    context_rotation=self.config.browser.context_rotation
+                )
             
             # Configura login handler
             self.login_handler = YouTubeLoginHandler(
                 self.browser_manager, 
-                self.credential_manager
+                self.credential_manager,
+                human_simulator=self.human_simulator,
+                logger=self.logger,
+                fast_fill=not self.config.automation.human_simulation
             )
             
             self.logger.info("✅ Aplicação inicializada com sucesso")
@@ -74,6 +123,7 @@ class YouTubeAutomationApp:
     
     async def run_automation(self, strategy: str = "hybrid"):
         """Executa automação principal"""
+        from src.automation.login_handler import LoginStrategy
         
         try:
             # Mapeia estratégias
@@ -114,15 +164,17 @@ class YouTubeAutomationApp:
         
         page = self.browser_manager.page
         
-        # Pausa inicial para "ler" a página
-        await self.human_simulator.simulate_reading_pause(200)
-        
-        # Movimentos aleatórios do mouse
-        await self.human_simulator.random_mouse_movement(page)
+        # Pausa inicial para "ler" a página enquanto o mouse se move
+        await asyncio.gather(
+            self.human_simulator.simulate_reading_pause(200),
+            self.human_simulator.random_mouse_movement(page)
+        )
         
-        # Scroll exploratório
-        await self.human_simulator.human_scroll(page, 'down', 3)
-        await asyncio.sleep(2.0)
+        # Scroll exploratório (a pausa corre junto com a descida)
+        await asyncio.gather(
+            self.human_simulator.human_scroll(page, 'down', 3),
+            asyncio.sleep(2.0)
+        )
         await self.human_simulator.human_scroll(page, 'up', 1)
         
         self.logger.info("✅ Simulação de comportamento humano concluída")
@@ -151,14 +203,23 @@ class YouTubeAutomationApp:
         except Exception as e:
             self.logger.warning(f"Navegação para trending falhou: {e}")
         
-        # Captura screenshot final
-        screenshot_path = await self.browser_manager.take_screenshot("automation_complete.png")
-        self.logger.info(f"📸 Screenshot salvo: {screenshot_path}")
+        # Captura screenshot final sem bloquear o restante da execução
+        self.schedule_screenshot("automation_complete.png")
+    
+    def schedule_screenshot(self, filename: str):
+        """Dispara o screenshot em background; cleanup() aguarda os pendentes"""
+        task = asyncio.create_task(self.browser_manager.take_screenshot(filename))
+        self._pending_screenshots.add(task)
+        task.add_done_callback(self._pending_screenshots.discard)
+        return task
     
     async def cleanup(self):
         """Limpeza final"""
         self.logger.info("🧹 Executando limpeza...")
         
+        # Screenshots pendentes precisam do browser vivo
+        await asyncio.gather(*self._pending_screenshots, return_exceptions=True)
+        
         if self.browser_manager:
             await self.browser_manager.close_browser(save_session=True)
         
@@ -183,15 +244,14 @@ class YouTubeAutomationApp:
                 self.logger.info("🔄 Mantendo browser aberto para uso manual...")
                 self.logger.info("🔒 Pressione Ctrl+C para encerrar")
                 
-                try:
-                    while True:
-                        await asyncio.sleep(10)
-                        # Verificação periódica de saúde
-                        if not await self.login_handler._is_logged_in():
-                            self.logger.warning("⚠️ Sessão perdida detectada")
-                            break
-                except KeyboardInterrupt:
+                # Dorme até Ctrl+C ou um evento CDP (aba fechada/caída, redirecionamento ao login)
+                reason = await _wait_until_stopped(self.browser_manager)
+                if reason == "session_lost":
+                    self.logger.warning("⚠️ Sessão perdida detectada")
+                elif reason == "interrupted":
                     self.logger.info("🔒 Encerrando por solicitação do usuário")
+                else:
+                    self.logger.info("🔒 Browser fechado")
             
             return True
             
@@ -203,6 +263,28 @@ class YouTubeAutomationApp:
             await self.cleanup()
 
 
+async def run_daemon(profile: str, headless: bool):
+    """Mantém um browser stealth vivo para execuções com --connect"""
+    _require_nodriver()
+    from src.core.browser_manager import BrowserManager
+    from src.core.stealth_factory import write_endpoint, ENDPOINT_FILE
+    
+    manager = BrowserManager(profile_name=profile)
+    browser, _ = await manager.launch_stealth_browser(
+        headless=headless,
+        context_rotation=get_config().browser.context_rotation
+    )
+    endpoint = write_endpoint(browser)
+    print(f"🛰️  Daemon ativo em {endpoint} (gravado em {ENDPOINT_FILE})")
+    print("🔒 Pressione Ctrl+C para encerrar")
+    
+    try:
+        await _wait_until_stopped(manager)
+    finally:
+        ENDPOINT_FILE.unlink(missing_ok=True)
+        await manager.close_browser(save_session=True)
+
+
 def create_cli_parser():
     """Cria parser para CLI"""
     parser = argparse.ArgumentParser(
@@ -216,6 +298,8 @@ Exemplos de uso:
   %(prog)s --profile stealth        # Usa profile específico
   %(prog)s --headless               # Execução sem interface
   %(prog)s --keep-open              # Mantém browser aberto
+  %(prog)s --daemon                 # Mantém um browser vivo para --connect
+  %(prog)s --connect                # Reaproveita o browser do daemon
   %(prog)s --setup                  # Configura projeto inicial
         """
     )
@@ -245,6 +329,20 @@ Exemplos de uso:
         help="Mantém browser aberto após automação"
     )
     
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Mantém um browser stealth vivo e publica seu endpoint"
+    )
+    
+    parser.add_argument(
+        "--connect",
+        nargs="?",
+        const="",
+        metavar="HOST:PORT",
+        help="Conecta ao browser do --daemon em vez de lançar um novo"
+    )
+    
     parser.add_argument(
         "--setup",
         action="store_true",
@@ -267,26 +365,15 @@ Exemplos de uso:
     return parser
 
 
-async def main():
-    """Função principal"""
-    parser = create_cli_parser()
-    args = parser.parse_args()
-    
-    # Banner
-    print("=" * 60)
-    print("🤖 YOUTUBE AUTOMATION v2.0 - SISTEMA PROFISSIONAL")
-    print("=" * 60)
-    print("🛡️  Anti-detecção avançada | 🎭 Simulação humana")
-    print("🔐 Login inteligente | 📊 Logging estruturado")
-    print("=" * 60)
-    
+def main_sync(args) -> bool:
+    """Executa os modos sem browser (--setup, --credentials); retorna True se tratou algum"""
     try:
         # Configuração inicial se solicitado
         if args.setup:
             print("\n🔧 Executando configuração inicial...")
             setup_project()
             print("✅ Configuração inicial concluída!")
-            return
+            return True
         
         # Configuração de credenciais se solicitado
         if args.credentials:
@@ -296,18 +383,37 @@ async def main():
                 print("✅ Credenciais configuradas com sucesso!")
             else:
                 print("❌ Falha na configuração de credenciais")
-            return
-        
+            return True
+    
+    except KeyboardInterrupt:
+        print("\n🔒 Execução interrompida pelo usuário")
+        return True
+    except Exception as e:
+        print(f"\n❌ Erro fatal: {e}")
+        sys.exit(1)
+    
+    return False
+
+
+async def main(args):
+    """Função principal"""
+    try:
         # Configura nível de logging
         logger = get_logger()
         if hasattr(LogLevel, args.log_level):
             from src.utils.logger import LogManager
             LogManager.set_global_level(getattr(LogLevel, args.log_level))
         
+        # Modo daemon: só mantém o browser vivo
+        if args.daemon:
+            await run_daemon(args.profile, args.headless)
+            return
+        
         # Executa aplicação
         app = YouTubeAutomationApp(
             profile=args.profile,
-            headless=args.headless
+            headless=args.headless,
+            connect=args.connect
         )
         
         success = await app.run(
@@ -329,13 +435,22 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Verifica dependências críticas
-    try:
-        import nodriver
-    except ImportError:
-        print("❌ Dependência crítica não encontrada!")
-        print("📦 Execute: pip install -r requirements.txt")
-        sys.exit(1)
+    args = create_cli_parser().parse_args()
     
-    # Executa aplicação
-    asyncio.run(main())
+    # Banner
+    print("=" * 60)
+    print("🤖 YOUTUBE AUTOMATION v2.0 - SISTEMA PROFISSIONAL")
+    print("=" * 60)
+    print("🛡️  Anti-detecção avançada | 🎭 Simulação humana")
+    print("🔐 Login inteligente | 📊 Logging estruturado")
+    print("=" * 60)
+    
+    # --setup/--credentials não precisam de event loop
+    if not main_sync(args):
+        # Executa aplicação - com uvloop (libuv) quando disponível, menos overhead por callback
+        try:
+            import uvloop
+        except ImportError:
+            asyncio.run(main(args))
+        else:
+            uvloop.run(main(args))
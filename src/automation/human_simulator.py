@@ -11,28 +11,39 @@ import math
 from typing import Tuple, List, Optional
 import time
 
+try:
+    from nodriver import cdp
+except ImportError:
+    cdp = None
+
+
+# Padrões de digitação brasileiros (delays em ms entre caracteres)
+_SPEED_RANGE = (80, 200)
+_PAUSE_CHANCE = 0.05       # 5% chance de pausa
+_CORRECTION_CHANCE = 0.03  # 3% chance de correção
+_COMMON_DELAYS = {
+    ' ': (150, 300),       # Espaços mais lentos
+    '.': (200, 400),       # Pontuação mais lenta
+    '@': (100, 250),       # Símbolos especiais
+}
+_SHIFT_DELAY = (50, 150)   # Teclas com shift
+_SHIFT_CHARS = frozenset('!@#$%^&*()')
+
 
 class HumanBehaviorSimulator:
     """Simula comportamento humano realista"""
     
     def __init__(self):
-        self.typing_patterns = self._load_brazilian_typing_patterns()
         self.mouse_patterns = self._load_mouse_patterns()
         self.scroll_patterns = self._load_scroll_patterns()
-    
-    def _load_brazilian_typing_patterns(self) -> dict:
-        """Padrões de digitação brasileiros"""
-        return {
-            'speed_range': (80, 200),  # ms entre caracteres
-            'pause_chance': 0.05,      # 5% chance de pausa
-            'correction_chance': 0.03, # 3% chance de correção
-            'common_delays': {
-                ' ': (150, 300),       # Espaços mais lentos
-                '.': (200, 400),       # Pontuação mais lenta
-                '@': (100, 250),       # Símbolos especiais
-                'shift_keys': (50, 150) # Teclas com shift
-            }
-        }
+        # Gerador próprio com métodos já ligados: evita o lookup no módulo random a cada sorteio
+        self._rng = random.Random()
+        self._uniform = self._rng.uniform
+        self._randint = self._rng.randint
+        self._random = self._rng.random
+        self._choice = self._rng.choice
+        # Última posição do cursor enviada por human_mouse_movement
+        self._last_mouse_pos = (500, 300)
     
     def _load_mouse_patterns(self) -> dict:
         """Padrões de movimento do mouse"""
@@ -54,101 +65,138 @@ class HumanBehaviorSimulator:
             'scroll_back_chance': 0.1
         }
     
-    async def human_typing(self, element, text: str, simulate_mistakes: bool = True):
-        """Digitação com padrões humanos brasileiros"""
+    async def human_typing(self, element, text: str, simulate_mistakes: bool = True,
+                           clear: bool = True):
+        """Digitação com padrões humanos brasileiros (clear=False: campo recém-aberto, já vazio)"""
         if not text:
             return
         
-        # Limpa campo antes de digitar
-        await element.click(click_count=3)  # Seleciona tudo
-        await asyncio.sleep(random.uniform(0.1, 0.3))
+        # Foca e zera o valor numa única chamada, sem triplo clique nem pausa extra
+        if clear:
+            await element.apply("(el) => { el.focus(); if (el.value) el.value = ''; }")
         
-        for i, char in enumerate(text):
+        # Uma chamada element.type por trecho de mesmo ritmo, não por caractere
+        for segment, delay, think_pause, mistake in self._plan_typing(text, simulate_mistakes):
             # Simula pausas ocasionais (como pensar)
-            if random.random() < self.typing_patterns['pause_chance']:
-                await asyncio.sleep(random.uniform(0.5, 1.5))
+            if think_pause:
+                await asyncio.sleep(think_pause)
+            
+            # Simula correções ocasionais: erra o primeiro caractere do trecho
+            if mistake:
+                wrong_char, wrong_pause = mistake
+                await element.type(wrong_char, delay=delay)
+                await asyncio.sleep(wrong_pause)
+                
+                # Corrige com uma tecla Backspace de verdade ('\b' digitado vira caractere)
+                await self._press_backspace(element)
+                await asyncio.sleep(delay)
             
+            await element.type(segment, delay=delay)
+    
+    @staticmethod
+    async def fast_fill(element, text: str, clear: bool = True):
+        """Preenche o campo com um único Input.insertText (sem cadência humana)"""
+        if clear:
+            await element.apply("(el) => { el.focus(); if (el.value) el.value = ''; }")
+        await element.tab.send(cdp.input_.insert_text(text=text))
+    
+    @staticmethod
+    async def _press_backspace(element):
+        """Envia Backspace como evento de tecla (keyDown/keyUp) para o campo focado"""
+        key = dict(key="Backspace", code="Backspace", windows_virtual_key_code=8, native_virtual_key_code=8)
+        await element.tab.send(cdp.input_.dispatch_key_event("rawKeyDown", **key))
+        await element.tab.send(cdp.input_.dispatch_key_event("keyUp", **key))
+    
+    def _plan_typing(self, text: str, simulate_mistakes: bool) -> List[tuple]:
+        """Sorteia de uma vez os trechos (texto, delay, pausa, erro) da digitação"""
+        plan = []
+        current_range = None
+        
+        for i, char in enumerate(text):
             # Determina delay baseado no caractere
-            if char in self.typing_patterns['common_delays']:
-                delay_range = self.typing_patterns['common_delays'][char]
-            elif char.isupper() or char in '!@#$%^&*()':
-                delay_range = self.typing_patterns['common_delays']['shift_keys']
+            if char in _COMMON_DELAYS:
+                delay_range = _COMMON_DELAYS[char]
+            elif char.isupper() or char in _SHIFT_CHARS:
+                delay_range = _SHIFT_DELAY
             else:
-                delay_range = self.typing_patterns['speed_range']
+                delay_range = _SPEED_RANGE
             
-            delay = random.randint(*delay_range) / 1000.0
+            think_pause = self._uniform(0.5, 1.5) if self._random() < _PAUSE_CHANCE else 0
+            # Variação adicional no timing a cada 10 caracteres
+            if i % 10 == 1:
+                think_pause += self._uniform(0.05, 0.2)
+            mistake = None
+            if simulate_mistakes and self._random() < _CORRECTION_CHANCE:
+                mistake = (self._choice('abcdefghijklmnopqrstuvwxyz'), self._uniform(0.2, 0.5))
             
-            # Simula correções ocasionais
-            if simulate_mistakes and random.random() < self.typing_patterns['correction_chance']:
-                # Digita caractere errado
-                wrong_char = random.choice('abcdefghijklmnopqrstuvwxyz')
-                await element.type(wrong_char, delay=delay)
-                await asyncio.sleep(random.uniform(0.2, 0.5))
-                
-                # Corrige (backspace + caractere correto)
-                await element.press('Backspace')
-                await asyncio.sleep(random.uniform(0.1, 0.3))
-                await element.type(char, delay=delay)
+            # Pausa, erro ou mudança de ritmo abrem um novo trecho
+            if plan and delay_range is current_range and not think_pause and not mistake:
+                segment, delay, pause, previous_mistake = plan[-1]
+                plan[-1] = (segment + char, delay, pause, previous_mistake)
             else:
-                # Digita caractere correto
-                await element.type(char, delay=delay)
-            
-            # Variação adicional no timing
-            if i % 10 == 0:  # A cada 10 caracteres
-                await asyncio.sleep(random.uniform(0.05, 0.2))
+                plan.append((char, self._randint(*delay_range) / 1000.0, think_pause, mistake))
+                current_range = delay_range
+        
+        return plan
     
     async def human_mouse_movement(self, page, start_x: int, start_y: int, 
                                  end_x: int, end_y: int, duration: float = None):
         """Movimentos de mouse com aceleração/desaceleração natural"""
         
+        distance = math.sqrt((end_x - start_x)**2 + (end_y - start_y)**2)
         if duration is None:
-            distance = math.sqrt((end_x - start_x)**2 + (end_y - start_y)**2)
             duration = max(0.3, min(2.0, distance / 500))  # Duração baseada na distância
         
         steps = max(10, int(duration * 60))  # 60 FPS
         
+        # Trajetória e pausas calculadas antes do primeiro await: o loop só
+        # envia o movimento e dorme até o prazo do passo
+        plan = self._plan_mouse_path(start_x, start_y, end_x, end_y,
+                                     steps, duration / steps, distance)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        for x, y, pause in plan:
+            await page.mouse.move(x, y)
+            # Prazo acumulado: o tempo gasto no move sai da pausa, sem deriva
+            deadline += pause
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        
+        self._last_mouse_pos = (end_x, end_y)
+    
+    def _plan_mouse_path(self, start_x: float, start_y: float, end_x: float, end_y: float,
+                         steps: int, step_delay: float, distance: float) -> List[tuple]:
+        """Sorteia de uma vez (x, y, pausa) de cada passo do movimento"""
+        # Aliases locais: o loop roda 60-120 vezes por movimento
+        uniform, chance, sin, pi = self._uniform, self._random, math.sin, math.pi
+        dx, dy = end_x - start_x, end_y - start_y
+        intensity = distance / 4 * self.mouse_patterns['curve_intensity']
+        last = steps - 1
+        plan = []
+        
         for step in range(steps):
-            progress = step / (steps - 1)
-            
-            # Curva de aceleração/desaceleração (ease-in-out)
-            eased_progress = self._ease_in_out_cubic(progress)
+            t = step / last
             
-            # Posição base na linha reta
-            current_x = start_x + (end_x - start_x) * eased_progress
-            current_y = start_y + (end_y - start_y) * eased_progress
-            
-            # Adiciona curva natural (movimento não linear)
-            curve_offset = self._calculate_curve_offset(progress, distance/4)
-            current_x += curve_offset['x']
-            current_y += curve_offset['y']
-            
-            # Adiciona pequena variação aleatória
-            current_x += random.uniform(-2, 2)
-            current_y += random.uniform(-2, 2)
+            # Curva de aceleração/desaceleração (ease-in-out cúbico) sobre a linha reta
+            if t < 0.5:
+                eased = 4 * t * t * t
+            else:
+                u = -2 * t + 2
+                eased = 1 - u * u * u / 2
             
-            await page.mouse.move(current_x, current_y)
-            await asyncio.sleep(duration / steps)
+            # Curva sinusoidal sutil + pequena variação aleatória
+            curve = sin(t * pi) * intensity
+            x = start_x + dx * eased + curve * uniform(-1, 1) + uniform(-2, 2)
+            y = start_y + dy * eased + curve * uniform(-1, 1) + uniform(-2, 2)
             
-            # Pausas ocasionais durante movimento longo
-            if random.random() < 0.05 and step < steps - 5:
-                await asyncio.sleep(random.uniform(0.05, 0.15))
-    
-    def _ease_in_out_cubic(self, t: float) -> float:
-        """Função de easing cúbica para movimento natural"""
-        if t < 0.5:
-            return 4 * t * t * t
-        else:
-            return 1 - pow(-2 * t + 2, 3) / 2
-    
-    def _calculate_curve_offset(self, progress: float, intensity: float) -> dict:
-        """Calcula offset para criar movimento curvado"""
-        # Curva sinusoidal sutil
-        curve_factor = math.sin(progress * math.pi) * intensity * self.mouse_patterns['curve_intensity']
+            # Pausas ocasionais durante movimento longo somam-se ao intervalo do passo
+            pause = step_delay
+            if chance() < 0.05 and step < steps - 5:
+                pause += uniform(0.05, 0.15)
+            plan.append((x, y, pause))
         
-        return {
-            'x': curve_factor * random.uniform(-1, 1),
-            'y': curve_factor * random.uniform(-1, 1)
-        }
+        return plan
     
     async def human_click(self, page, element, click_type: str = 'single'):
         """Click com timing humano"""
@@ -157,21 +205,21 @@ class HumanBehaviorSimulator:
         box = await element.bounding_box()
         if box:
             # Calcula posição aleatória dentro do elemento
-            click_x = box['x'] + random.uniform(0.2, 0.8) * box['width']
-            click_y = box['y'] + random.uniform(0.2, 0.8) * box['height']
+            click_x = box['x'] + self._uniform(0.2, 0.8) * box['width']
+            click_y = box['y'] + self._uniform(0.2, 0.8) * box['height']
             
-            current_pos = await page.evaluate('() => ({ x: window.mouseX || 0, y: window.mouseY || 0 })')
+            current_x, current_y = self._last_mouse_pos
             
             await self.human_mouse_movement(
                 page, 
-                current_pos.get('x', 0), 
-                current_pos.get('y', 0),
+                current_x, 
+                current_y,
                 click_x, 
                 click_y
             )
             
             # Pausa antes do click
-            await asyncio.sleep(random.uniform(0.1, 0.3))
+            await asyncio.sleep(self._uniform(0.1, 0.3))
             
             if click_type == 'single':
                 await element.click()
@@ -179,62 +227,69 @@ class HumanBehaviorSimulator:
                 await element.dblclick()
             
             # Pequena pausa após click
-            await asyncio.sleep(random.uniform(0.1, 0.2))
+            await asyncio.sleep(self._uniform(0.1, 0.2))
     
     async def human_scroll(self, page, direction: str = 'down', amount: int = None):
         """Scroll com padrões humanos"""
         
         if amount is None:
-            amount = random.randint(2, 5)
-        
-        scroll_patterns = self.scroll_patterns
+            amount = self._randint(2, 5)
         
-        for i in range(amount):
-            # Velocidade variável
-            if scroll_patterns['variable_speed']:
-                scroll_delta = random.randint(*scroll_patterns['scroll_speed'])
-            else:
-                scroll_delta = scroll_patterns['scroll_speed'][0]
-            
-            if direction == 'down':
-                await page.mouse.wheel(0, scroll_delta)
-            else:
-                await page.mouse.wheel(0, -scroll_delta)
-            
-            # Pausa entre scrolls
-            pause = random.randint(*scroll_patterns['pause_between_scrolls']) / 1000.0
+        for delta, pause, back in self._plan_scroll(direction, amount):
+            await page.mouse.wheel(0, delta)
             await asyncio.sleep(pause)
             
             # Ocasionalmente scroll para trás (como humano verificando algo)
-            if random.random() < scroll_patterns['scroll_back_chance']:
-                small_back = scroll_delta // 3
-                await page.mouse.wheel(0, -small_back if direction == 'down' else small_back)
-                await asyncio.sleep(random.uniform(0.2, 0.5))
+            if back:
+                back_delta, back_pause = back
+                await page.mouse.wheel(0, back_delta)
+                await asyncio.sleep(back_pause)
+    
+    def _plan_scroll(self, direction: str, amount: int) -> List[tuple]:
+        """Sorteia de uma vez (delta, pausa, volta) de cada scroll"""
+        patterns = self.scroll_patterns
+        speed_range = patterns['scroll_speed']
+        pause_range = patterns['pause_between_scrolls']
+        back_chance = patterns['scroll_back_chance']
+        sign = 1 if direction == 'down' else -1
+        plan = []
+        
+        for _ in range(amount):
+            # Velocidade variável
+            scroll_delta = self._randint(*speed_range) if patterns['variable_speed'] else speed_range[0]
+            pause = self._randint(*pause_range) / 1000.0
+            
+            back = None
+            if self._random() < back_chance:
+                back = (-sign * (scroll_delta // 3), self._uniform(0.2, 0.5))
+            plan.append((sign * scroll_delta, pause, back))
+        
+        return plan
     
     async def simulate_reading_pause(self, content_length: int = 100):
         """Simula tempo de leitura baseado no comprimento do conteúdo"""
         # Fórmula baseada em velocidade média de leitura (200-300 palavras/min)
         words_estimate = content_length / 5  # Estimativa: 5 caracteres por palavra
-        reading_time = words_estimate / random.uniform(3, 5)  # 3-5 palavras por segundo
+        reading_time = words_estimate / self._uniform(3, 5)  # 3-5 palavras por segundo
         
         # Adiciona variação humana
-        pause_time = max(0.5, reading_time + random.uniform(-0.5, 1.0))
+        pause_time = max(0.5, reading_time + self._uniform(-0.5, 1.0))
         
         await asyncio.sleep(pause_time)
     
     async def simulate_decision_pause(self):
         """Simula pausa de tomada de decisão"""
-        await asyncio.sleep(random.uniform(0.8, 2.5))
+        await asyncio.sleep(self._uniform(0.8, 2.5))
     
     async def random_mouse_movement(self, page, viewport_width: int = 1366, viewport_height: int = 768):
         """Movimento aleatório do mouse para simular atividade humana"""
-        current_pos = await page.evaluate('() => ({ x: window.mouseX || 500, y: window.mouseY || 300 })')
+        current_x, current_y = self._last_mouse_pos
         
         # Movimento próximo à posição atual
-        new_x = max(0, min(viewport_width, current_pos.get('x', 500) + random.randint(-100, 100)))
-        new_y = max(0, min(viewport_height, current_pos.get('y', 300) + random.randint(-100, 100)))
+        new_x = max(0, min(viewport_width, current_x + self._randint(-100, 100)))
+        new_y = max(0, min(viewport_height, current_y + self._randint(-100, 100)))
         
-        await self.human_mouse_movement(page, current_pos.get('x', 500), current_pos.get('y', 300), new_x, new_y)
+        await self.human_mouse_movement(page, current_x, current_y, new_x, new_y)
     
     async def simulate_multitasking_behavior(self, page):
         """Simula comportamento de multitasking (mudança de abas, etc.)"""
@@ -245,30 +300,30 @@ class HumanBehaviorSimulator:
             self._simulate_scroll_exploration
         ]
         
-        behavior = random.choice(behaviors)
+        behavior = self._choice(behaviors)
         await behavior(page)
     
     async def _simulate_tab_switch(self, page):
         """Simula mudança rápida de aba"""
         await page.keyboard.press('Alt+Tab')
-        await asyncio.sleep(random.uniform(0.5, 2.0))
+        await asyncio.sleep(self._uniform(0.5, 2.0))
         await page.keyboard.press('Alt+Tab')
     
     async def _simulate_window_resize(self, page):
         """Simula pequeno ajuste de janela"""
         # Simula movimento sutil da janela
-        await asyncio.sleep(random.uniform(1.0, 3.0))
+        await asyncio.sleep(self._uniform(1.0, 3.0))
     
     async def _simulate_page_refresh_check(self, page):
         """Simula verificação de atualização da página"""
         await page.keyboard.press('F5')
-        await asyncio.sleep(random.uniform(2.0, 4.0))
+        await asyncio.sleep(self._uniform(2.0, 4.0))
     
     async def _simulate_scroll_exploration(self, page):
         """Simula exploração da página com scroll"""
-        await self.human_scroll(page, 'down', random.randint(2, 4))
-        await asyncio.sleep(random.uniform(1.0, 3.0))
-        await self.human_scroll(page, 'up', random.randint(1, 2))
+        await self.human_scroll(page, 'down', self._randint(2, 4))
+        await asyncio.sleep(self._uniform(1.0, 3.0))
+        await self.human_scroll(page, 'up', self._randint(1, 2))
 
 
 class BrazilianBehaviorProfile:
@@ -281,9 +336,18 @@ class BrazilianBehaviorProfile:
             'evening': {'energy': 0.8, 'speed_multiplier': 0.85},
             'night': {'energy': 0.6, 'speed_multiplier': 0.7}
         }
+        # O período só muda de hora em hora: recalcula no máximo a cada 60s
+        self._cached_modifier = None
+        self._factor = 1.0  # speed_multiplier * energy do período em cache
+        self._cache_expiry_ns = 0
+        self._uniform = random.Random().uniform
     
     def get_current_behavior_modifier(self) -> dict:
         """Retorna modificador baseado no horário brasileiro"""
+        now = time.monotonic_ns()
+        if now < self._cache_expiry_ns:
+            return self._cached_modifier
+        
         current_hour = time.localtime().tm_hour
         
         if 6 <= current_hour < 12:
@@ -295,15 +359,14 @@ class BrazilianBehaviorProfile:
         else:
             period = 'night'
         
-        return self.activity_patterns[period]
+        modifier = self.activity_patterns[period]
+        self._cached_modifier = modifier
+        self._factor = modifier['speed_multiplier'] * modifier['energy']
+        self._cache_expiry_ns = now + 60_000_000_000
+        return modifier
     
     def apply_brazilian_timing(self, base_delay: float) -> float:
-        """Aplica modificadores de timing brasileiro"""
-        modifier = self.get_current_behavior_modifier()
-        adjusted_delay = base_delay * modifier['speed_multiplier']
-        
-        # Adiciona variação baseada na "energia" do período
-        energy_factor = modifier['energy']
-        variation = random.uniform(0.8, 1.2) * energy_factor
-        
-        return adjusted_delay * variation
+        """Aplica modificadores de timing brasileiro (velocidade e "energia" do período)"""
+        if time.monotonic_ns() >= self._cache_expiry_ns:
+            self.get_current_behavior_modifier()
+        return base_delay * self._factor * self._uniform(0.8, 1.2)
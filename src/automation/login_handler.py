@@ -6,12 +6,18 @@ Sistema avançado de login com múltiplas estratégias e detecção inteligente.
 """
 
 import asyncio
+import json
 import random
+import re
+import sys
+import threading
+import time
 from typing import Optional, Dict, Any, List
 from enum import Enum
 
 from ..automation.human_simulator import HumanBehaviorSimulator
 from ..security.credential_manager import CredentialManager
+from ..utils.logger import AutomationLogger, get_logger
 
 
 class LoginStrategy(Enum):
@@ -30,28 +36,278 @@ class LoginResult(Enum):
     ACCOUNT_LOCKED = "account_locked"
     CAPTCHA_REQUIRED = "captcha_required"
     MANUAL_INTERVENTION = "manual_intervention"
+    INVALID_CREDENTIALS = "invalid_credentials"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+# Únicos resultados que justificam repetir a estratégia: nada foi submetido ao
+# Google ainda ou a falha foi transitória. Credenciais recusadas nunca são reenviadas.
+_RETRYABLE_RESULTS = frozenset({
+    LoginResult.TIMEOUT,
+    LoginResult.ERROR,
+    LoginResult.CAPTCHA_REQUIRED,
+})
+
+# Retorna o primeiro seletor presente no DOM (na ordem dada) numa única
+# avaliação; entende também os pseudo-seletores :has-text("...") e text="..."
+_FIRST_MATCH_JS = """
+((selectors) => {
+    for (const s of selectors) {
+        try {
+            const has = s.match(/^(.*):has-text\\("(.*)"\\)$/);
+            if (has) {
+                const hit = Array.from(document.querySelectorAll(has[1]))
+                    .some(e => e.textContent.includes(has[2]));
+                if (hit) return s;
+                continue;
+            }
+            const text = s.match(/^text="(.*)"$/);
+            if (text) {
+                if (document.body && document.body.innerText.includes(text[1])) return s;
+                continue;
+            }
+            if (document.querySelector(s)) return s;
+        } catch (e) {}
+    }
+    return null;
+})(%s)
+"""
+
+# Pseudo-seletores de texto (mesma sintaxe entendida por _FIRST_MATCH_JS)
+_HAS_TEXT_RE = re.compile(r'^(.*):has-text\("(.*)"\)$')
+_TEXT_RE = re.compile(r'^text="(.*)"$')
+
+
+def selector_text(selector: str) -> Optional[str]:
+    """Texto buscado por um pseudo-seletor :has-text("...")/text="..."; None se for CSS puro"""
+    match = _HAS_TEXT_RE.match(selector) or _TEXT_RE.match(selector)
+    return match.group(match.lastindex) if match else None
+
+
+# Fragmentos de URL que decidem o status de login sem consultar o DOM
+_LOGGED_IN_URL_MARKERS = ('myaccount.google.com', '/ManageAccount')
+_LOGGED_OUT_URL_MARKERS = ('accounts.google.com/signin', 'accounts.google.com/ServiceLogin')
+
+# Seletores do fluxo de login: tuplas montadas uma vez no import
+_EMAIL_SELECTORS = (
+    'input[type="email"]',
+    'input[id="identifierId"]',
+    'input[name="identifier"]',
+    'input[autocomplete="username"]',
+)
+
+_PASSWORD_SELECTORS = (
+    'input[type="password"]',
+    'input[name="password"]',
+    'input[autocomplete="current-password"]',
+)
+
+_NEXT_SELECTORS = (
+    'button[id="identifierNext"]',
+    'button:has-text("Próximo")',
+    'button:has-text("Next")',
+    'input[type="submit"]',
+    'button[type="submit"]',
+)
+
+_LOGIN_BUTTON_SELECTORS = (
+    'button[id="passwordNext"]',
+    'button:has-text("Entrar")',
+    'button:has-text("Sign in")',
+    'button:has-text("Login")',
+    'input[type="submit"]',
+    'button[type="submit"]',
+)
+
+_CAPTCHA_INDICATORS = (
+    'div[class*="captcha"]',
+    'iframe[src*="captcha"]',
+    'div[class*="recaptcha"]',
+    'text="Please verify"',
+    'text="Verificação necessária"',
+)
+
+_SUCCESS_INDICATORS = (
+    'accounts.google.com/b/0/ManageAccount',
+    'myaccount.google.com',
+    'text="Conta Google"',
+    'button[aria-label*="Conta"]',
+    'img[alt*="Avatar"]',
+)
+
+_ERROR_INDICATORS = (
+    'text="Senha incorreta"',
+    'text="Wrong password"',
+    'text="Couldn\'t sign in"',
+    'text="Não foi possível fazer login"',
+    'div[class*="error"]',
+    'div[class*="warning"]',
+)
+
+# Elementos que só existem com sessão ativa no YouTube
+_LOGGED_IN_INDICATORS = (
+    'button[aria-label*="Conta do Google"]',
+    'button[aria-label*="conta"]',
+    'img[id="avatar-btn"]',
+    'button[id="avatar-btn"]',
+    'yt-img-shadow[id="avatar"]',
+    '[aria-label*="Avatar"]',
+)
+
+# Botões de "Fazer login" (sem sessão)
+_SIGNIN_INDICATORS = (
+    'a:has-text("Fazer login")',
+    'a:has-text("Sign in")',
+    'paper-button:has-text("FAZER LOGIN")',
+)
+
+# Snapshot do status de login avaliado logo após a navegação
+_LOGIN_STATE_JS = _FIRST_MATCH_JS % json.dumps(list(_LOGGED_IN_INDICATORS + _SIGNIN_INDICATORS))
+
+_AVATAR_SELECTORS = (
+    'button[id="avatar-btn"]',
+    'yt-img-shadow[id="avatar"]',
+    'button[aria-label*="conta"]',
+)
+
+_LOGOUT_SELECTORS = (
+    'a:has-text("Sair")',
+    'a:has-text("Sign out")',
+    'yt-formatted-string:has-text("Sair")',
+)
 
 
 class YouTubeLoginHandler:
     """Handler inteligente para login no YouTube"""
     
-    def __init__(self, browser_manager, credential_manager: CredentialManager = None):
+    # Backoff exponencial com jitter entre tentativas (segundos)
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+    RETRY_JITTER = 0.5
+    
+    # Validade da sessão confirmada por este handler no browser atual
+    SESSION_CACHE_TTL = 300
+    # Validade da resposta de _is_logged_in enquanto a URL não muda
+    LOGIN_STATE_TTL = 1.5
+    # Tempo máximo da sondagem de sessão que corre junto com a pausa antes da página de login
+    SESSION_PROBE_TIMEOUT = 1.5
+    # Tempo (s) que os snapshots de indicadores esperam a página renderizar algum deles
+    INDICATOR_WAIT_TIMEOUT = 2.0
+    
+    def __init__(self, browser_manager, credential_manager: CredentialManager = None,
+                 human_simulator: HumanBehaviorSimulator = None,
+                 logger: AutomationLogger = None, fast_fill: bool = False):
         self.browser_manager = browser_manager
         self.credential_manager = credential_manager or CredentialManager()
-        self.human_simulator = HumanBehaviorSimulator()
+        self.human_simulator = human_simulator or HumanBehaviorSimulator()
+        self.logger = logger or get_logger()
+        # Email/senha num único Input.insertText quando a simulação humana está desligada
+        self.fast_fill = fast_fill
         self.max_retry_attempts = 3
+        # Último resultado de _is_logged_in: (url, monotonic, logado)
+        self._login_state_cache: Optional[tuple] = None
+        # Última sessão confirmada: (browser, monotonic); outro browser (ex.: --connect) não herda
+        self._session_cache: Optional[tuple] = None
+    
+    async def _find_one(self, selector: str, timeout: float):
+        """Aguarda um seletor por até timeout segundos: CSS via select, pseudo-seletores de texto via find"""
+        page = self.browser_manager.page
+        text = selector_text(selector)
+        if text is None:
+            return await page.select(selector, timeout=timeout)
+        return await page.find(text, best_match=True, timeout=timeout)
+    
+    async def _race_find(self, selectors: List[str], timeout: float) -> tuple:
+        """Busca todos os seletores em paralelo (timeout em segundos); retorna (seletor, elemento) do primeiro encontrado"""
+        tasks = {asyncio.create_task(self._find_one(selector, timeout)): selector for selector in selectors}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.exception() and task.result():
+                        return tasks[task], task.result()
+            return None, None
+        finally:
+            # Perdedores não devem continuar consultando o DOM
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Pausa da tentativa N: dobra a cada tentativa, com jitter e teto"""
+        delay = self.RETRY_BASE_DELAY * 2 ** attempt * (1 + random.uniform(0, self.RETRY_JITTER))
+        return min(self.RETRY_MAX_DELAY, delay)
+    
+    @staticmethod
+    def _is_recoverable(result: LoginResult) -> bool:
+        """Falhas transitórias (rede, timeout, captcha) merecem nova tentativa"""
+        return result in _RETRYABLE_RESULTS
+    
+    async def _automatic_login_with_retry(self) -> LoginResult:
+        """Login automático com até max_retry_attempts tentativas e backoff exponencial"""
+        for attempt in range(self.max_retry_attempts):
+            result = await self._automatic_login()
+            if result == LoginResult.SUCCESS or not self._is_recoverable(result):
+                return result
+            
+            if attempt < self.max_retry_attempts - 1:
+                delay = self._backoff_delay(attempt)
+                self.logger.info(f"🔁 Nova tentativa de login em {delay:.1f}s ({attempt + 2}/{self.max_retry_attempts})")
+                await asyncio.sleep(delay)
+        
+        return result
+    
+    async def _wait_ready(self, extra_min: float = 0.3, extra_max: float = 0.8,
+                          timeout: float = 5.0, from_url: str = None):
+        """Aguarda document.readyState == 'complete' (e a troca de URL, se from_url) e aplica só um jitter humano curto"""
+        page = self.browser_manager.page
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                # Após um clique o documento antigo ainda está 'complete': exige URL nova
+                if (from_url is None or page.url != from_url) and \
+                        await page.evaluate("document.readyState") == "complete":
+                    break
+            except Exception:
+                pass  # Contexto trocando no meio da navegação
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(random.uniform(extra_min, extra_max))
+    
+    async def _first_match_js(self, selectors) -> Optional[str]:
+        """Testa todos os seletores numa única chamada CDP; retorna o primeiro presente ou None"""
+        try:
+            return await self.browser_manager.page.evaluate(_FIRST_MATCH_JS % json.dumps(list(selectors)))
+        except Exception:
+            return None
+    
+    async def _wait_first_match_js(self, selectors, timeout: float, interval: float = 0.25) -> Optional[str]:
+        """Repete _first_match_js até algum seletor aparecer ou timeout segundos passarem"""
+        deadline = time.monotonic() + timeout
+        while True:
+            indicator = await self._first_match_js(selectors)
+            if indicator or time.monotonic() >= deadline:
+                return indicator
+            await asyncio.sleep(interval)
+    
+    async def _first_matching_selector(self, selectors: List[str], timeout: float):
+        """Busca todos os seletores em paralelo e retorna o primeiro elemento encontrado"""
+        _, element = await self._race_find(selectors, timeout)
+        return element
         
     async def login(self, strategy: LoginStrategy = LoginStrategy.HYBRID_APPROACH) -> LoginResult:
         """Executa login com estratégia especificada"""
         
-        print(f"🔐 Iniciando login com estratégia: {strategy.value}")
+        self.logger.info(f"🔐 Iniciando login com estratégia: {strategy.value}")
+        self._login_state_cache = None
         
         try:
             if strategy == LoginStrategy.SESSION_RESTORE:
                 return await self._try_session_restore()
             
             elif strategy == LoginStrategy.AUTOMATIC_LOGIN:
-                return await self._automatic_login()
+                return await self._automatic_login_with_retry()
             
             elif strategy == LoginStrategy.MANUAL_ASSISTED:
                 return await self._manual_assisted_login()
@@ -60,79 +316,111 @@ class YouTubeLoginHandler:
                 return await self._hybrid_login_approach()
             
             else:
-                print("❌ Estratégia de login não reconhecida")
+                self.logger.warning("❌ Estratégia de login não reconhecida")
                 return LoginResult.FAILED
                 
         except Exception as e:
-            print(f"❌ Erro durante login: {e}")
+            self.logger.error(f"❌ Erro durante login: {e}")
             return LoginResult.FAILED
     
     async def _hybrid_login_approach(self) -> LoginResult:
         """Abordagem híbrida - tenta múltiplas estratégias"""
         
         strategies = [
-            (LoginStrategy.SESSION_RESTORE, "Verificando sessão existente"),
-            (LoginStrategy.AUTOMATIC_LOGIN, "Tentando login automático"),
-            (LoginStrategy.MANUAL_ASSISTED, "Solicitando assistência manual")
+            (self._try_session_restore, "Verificando sessão existente"),
+            (self._automatic_login_with_retry, "Tentando login automático"),
+            (self._manual_assisted_login, "Solicitando assistência manual")
         ]
         
-        for strategy, description in strategies:
-            print(f"🔄 {description}...")
+        for attempt, (run_strategy, description) in enumerate(strategies):
+            self.logger.info(f"🔄 {description}...")
             
-            if strategy == LoginStrategy.SESSION_RESTORE:
-                result = await self._try_session_restore()
-            elif strategy == LoginStrategy.AUTOMATIC_LOGIN:
-                result = await self._automatic_login()
-            else:
-                result = await self._manual_assisted_login()
+            result = await run_strategy()
             
             if result == LoginResult.SUCCESS:
                 return result
             
-            # Pausa entre tentativas
-            await asyncio.sleep(random.uniform(2.0, 4.0))
+            # Pausa entre tentativas (falhas definitivas passam direto à próxima estratégia)
+            if self._is_recoverable(result):
+                await asyncio.sleep(self._backoff_delay(attempt))
         
         return LoginResult.FAILED
     
     async def _try_session_restore(self) -> LoginResult:
         """Tenta restaurar sessão existente"""
         
-        # Navega para YouTube
-        await self.browser_manager.navigate_safely('https://www.youtube.com')
+        # Sessão confirmada há pouco neste browser: dispensa só as verificações de login
+        entry = self._session_cache
+        if entry and entry[0] is self.browser_manager.browser and \
+                time.monotonic() - entry[1] < self.SESSION_CACHE_TTL:
+            self.logger.info("✅ Sessão confirmada recentemente - usando cache")
+            # Chamadores seguem a partir do YouTube, esteja a aba onde estiver
+            await self.browser_manager.navigate_safely('https://www.youtube.com')
+            self._login_state_cache = None
+            return LoginResult.SUCCESS
+        
+        # Navega para YouTube e lê o status de login na mesma passada
+        indicator = await self.browser_manager.navigate_and_check('https://www.youtube.com', _LOGIN_STATE_JS)
+        self._login_state_cache = None
+        if indicator:
+            self._login_state_cache = (self.browser_manager.page.url or "", time.monotonic(),
+                                       indicator in _LOGGED_IN_INDICATORS)
         
-        # Verifica se já está logado
+        # Verifica se já está logado (header ainda não renderizado cai nas verificações completas)
         if await self._is_logged_in():
-            print("✅ Já logado - usando sessão existente")
+            self.logger.info("✅ Já logado - usando sessão existente")
+            self._session_cache = (self.browser_manager.browser, time.monotonic())
             return LoginResult.SUCCESS
         
         # Tenta restaurar sessão salva
         if await self.browser_manager.restore_session():
-            await asyncio.sleep(random.uniform(2.0, 4.0))
+            self._login_state_cache = None
+            await self._wait_ready()
             
             if await self._is_logged_in():
-                print("✅ Sessão restaurada com sucesso")
+                self.logger.info("✅ Sessão restaurada com sucesso")
+                self._session_cache = (self.browser_manager.browser, time.monotonic())
                 return LoginResult.SUCCESS
         
-        print("📝 Sessão não disponível")
+        self.logger.info("📝 Sessão não disponível")
+        self._session_cache = None
         return LoginResult.FAILED
     
     async def _automatic_login(self) -> LoginResult:
         """Tentativa de login automático"""
         
-        # Obtém credenciais
-        credentials = self.credential_manager.get_credentials()
-        if not credentials:
-            print("❌ Credenciais não disponíveis para login automático")
-            return LoginResult.MANUAL_INTERVENTION
+        self.logger.info("🤖 Iniciando login automático...")
         
-        print("🤖 Iniciando login automático...")
+        # Obtém credenciais (KDF/descriptografia em thread) enquanto a página de login carrega
+        creds_task = asyncio.create_task(asyncio.to_thread(self.credential_manager.get_credentials))
+        password_submitted = False
         
         try:
+            # Sonda a sessão do profile durante a pausa humana que antecede a navegação:
+            # a página ainda é a atual (nenhum goto enviado) e o caminho deslogado não espera a mais
+            human_delay = asyncio.create_task(asyncio.sleep(self.browser_manager.pre_navigation_delay()))
+            try:
+                if await self._logged_in_within(self.SESSION_PROBE_TIMEOUT):
+                    self.logger.info("✅ Sessão já ativa - login automático dispensado")
+                    if 'youtube.com' not in (self.browser_manager.page.url or ""):
+                        await self.browser_manager.navigate_safely('https://www.youtube.com')
+                    return LoginResult.SUCCESS
+                await human_delay
+            finally:
+                human_delay.cancel()
+            
             # Navega para página de login
-            await self.browser_manager.navigate_safely('https://accounts.google.com/signin')
+            await self.browser_manager.navigate_safely('https://accounts.google.com/signin',
+                                                       human_delay=False)
+            self._login_state_cache = None
+            
+            credentials = await creds_task
+            if not credentials:
+                self.logger.warning("❌ Credenciais não disponíveis para login automático")
+                return LoginResult.MANUAL_INTERVENTION
             
             # Aguarda página de login carregar
-            await asyncio.sleep(random.uniform(2.0, 4.0))
+            await self._wait_ready()
             
             # Preenche email
             result = await self._fill_email_field(credentials['email'])
@@ -140,219 +428,141 @@ class YouTubeLoginHandler:
                 return result
             
             # Preenche senha
+            password_url = self.browser_manager.page.url
             result = await self._fill_password_field(credentials['password'])
             if result != LoginResult.SUCCESS:
                 return result
+            password_submitted = True
             
-            # Verifica sucesso do login
-            await asyncio.sleep(random.uniform(3.0, 6.0))
+            # Verifica sucesso do login (redirecionamento pós-senha)
+            await self._wait_ready(1.0, 2.0, timeout=10.0, from_url=password_url)
             
-            if await self._check_login_success():
-                print("🎉 Login automático realizado com sucesso!")
+            result = await self._check_login_success()
+            if result == LoginResult.SUCCESS:
+                self.logger.info("🎉 Login automático realizado com sucesso!")
                 await self.browser_manager.navigate_safely('https://www.youtube.com')
-                return LoginResult.SUCCESS
+            elif result == LoginResult.INVALID_CREDENTIALS:
+                self.logger.warning("❌ Credenciais recusadas pelo Google")
             else:
-                print("❌ Login automático falhou")
-                return LoginResult.FAILED
+                self.logger.warning("❌ Login automático falhou")
+            return result
                 
         except Exception as e:
-            print(f"❌ Erro no login automático: {e}")
-            return LoginResult.FAILED
+            self.logger.error(f"❌ Erro no login automático: {e}")
+            # Senha já enviada: repetir poderia reenviá-la (ou repetir um login que deu certo)
+            return LoginResult.FAILED if password_submitted else LoginResult.ERROR
+        
+        finally:
+            # Navegação falhou antes de consumir as credenciais: não deixa a task órfã
+            if not creds_task.done():
+                creds_task.cancel()
     
     async def _fill_email_field(self, email: str) -> LoginResult:
         """Preenche campo de email"""
         try:
-            # Localiza campo de email
-            email_selectors = [
-                'input[type="email"]',
-                'input[id="identifierId"]',
-                'input[name="identifier"]',
-                'input[autocomplete="username"]'
-            ]
-            
-            email_field = None
-            for selector in email_selectors:
-                try:
-                    email_field = await self.browser_manager.page.find(selector, timeout=3000)
-                    if email_field:
-                        break
-                except:
-                    continue
+            email_field = await self._first_matching_selector(_EMAIL_SELECTORS, timeout=3)
             
             if not email_field:
-                print("❌ Campo de email não encontrado")
-                return LoginResult.FAILED
+                self.logger.warning("❌ Campo de email não encontrado")
+                return LoginResult.TIMEOUT
             
-            # Preenche email com simulação humana
+            # Preenche email (simulação humana ou Input.insertText único)
             await self.human_simulator.human_click(self.browser_manager.page, email_field)
-            await self.human_simulator.human_typing(email_field, email)
+            if self.fast_fill:
+                await self.human_simulator.fast_fill(email_field, email)
+            else:
+                await self.human_simulator.human_typing(email_field, email)
             
             # Clica em "Próximo"
             next_button = await self._find_next_button()
             if next_button:
                 await self.human_simulator.human_click(self.browser_manager.page, next_button)
+                # Pausa humana mantida: o Google limita fluxos email→senha rápidos demais
                 await asyncio.sleep(random.uniform(2.0, 4.0))
             
             return LoginResult.SUCCESS
             
         except Exception as e:
-            print(f"❌ Erro ao preencher email: {e}")
-            return LoginResult.FAILED
+            self.logger.error(f"❌ Erro ao preencher email: {e}")
+            return LoginResult.ERROR
     
     async def _fill_password_field(self, password: str) -> LoginResult:
         """Preenche campo de senha"""
+        submitted = False
         try:
-            # Aguarda campo de senha aparecer
-            password_selectors = [
-                'input[type="password"]',
-                'input[name="password"]',
-                'input[autocomplete="current-password"]'
-            ]
-            
-            password_field = None
-            for selector in password_selectors:
-                try:
-                    password_field = await self.browser_manager.page.find(selector, timeout=5000)
-                    if password_field:
-                        break
-                except:
-                    continue
+            password_field = await self._first_matching_selector(_PASSWORD_SELECTORS, timeout=5)
             
             if not password_field:
-                print("❌ Campo de senha não encontrado")
+                self.logger.warning("❌ Campo de senha não encontrado")
                 
                 # Verifica se há captcha ou outros bloqueios
                 if await self._detect_captcha():
                     return LoginResult.CAPTCHA_REQUIRED
                 
-                return LoginResult.FAILED
+                return LoginResult.TIMEOUT
             
-            # Preenche senha com simulação humana
+            # Preenche senha (simulação humana ou Input.insertText único)
             await self.human_simulator.human_click(self.browser_manager.page, password_field)
-            await self.human_simulator.human_typing(password_field, password, simulate_mistakes=False)
+            # Página de senha acabou de abrir: campo vazio e já focado pelo clique
+            if self.fast_fill:
+                await self.human_simulator.fast_fill(password_field, password, clear=False)
+            else:
+                await self.human_simulator.human_typing(password_field, password,
+                                                        simulate_mistakes=False, clear=False)
             
             # Clica em "Próximo" ou "Entrar"
             login_button = await self._find_login_button()
             if login_button:
+                pre_click_url = self.browser_manager.page.url
+                submitted = True
                 await self.human_simulator.human_click(self.browser_manager.page, login_button)
-                await asyncio.sleep(random.uniform(2.0, 4.0))
+                self._login_state_cache = None
+                await self._wait_ready(from_url=pre_click_url)
             
             return LoginResult.SUCCESS
             
         except Exception as e:
-            print(f"❌ Erro ao preencher senha: {e}")
-            return LoginResult.FAILED
+            self.logger.error(f"❌ Erro ao preencher senha: {e}")
+            return LoginResult.FAILED if submitted else LoginResult.ERROR
     
     async def _find_next_button(self):
         """Localiza botão 'Próximo'"""
-        next_selectors = [
-            'button[id="identifierNext"]',
-            'button:has-text("Próximo")',
-            'button:has-text("Next")',
-            'input[type="submit"]',
-            'button[type="submit"]'
-        ]
-        
-        for selector in next_selectors:
-            try:
-                button = await self.browser_manager.page.find(selector, timeout=2000)
-                if button:
-                    return button
-            except:
-                continue
-        
-        return None
+        return await self._first_matching_selector(_NEXT_SELECTORS, timeout=2)
     
     async def _find_login_button(self):
         """Localiza botão de login"""
-        login_selectors = [
-            'button[id="passwordNext"]',
-            'button:has-text("Entrar")',
-            'button:has-text("Sign in")',
-            'button:has-text("Login")',
-            'input[type="submit"]',
-            'button[type="submit"]'
-        ]
-        
-        for selector in login_selectors:
-            try:
-                button = await self.browser_manager.page.find(selector, timeout=2000)
-                if button:
-                    return button
-            except:
-                continue
-        
-        return None
+        return await self._first_matching_selector(_LOGIN_BUTTON_SELECTORS, timeout=2)
     
     async def _detect_captcha(self) -> bool:
         """Detecta presença de captcha"""
-        captcha_indicators = [
-            'div[class*="captcha"]',
-            'iframe[src*="captcha"]',
-            'div[class*="recaptcha"]',
-            'text="Please verify"',
-            'text="Verificação necessária"'
-        ]
-        
-        for indicator in captcha_indicators:
-            try:
-                element = await self.browser_manager.page.find(indicator, timeout=1000)
-                if element:
-                    print("🤖 Captcha detectado")
-                    return True
-            except:
-                continue
+        if await self._first_match_js(_CAPTCHA_INDICATORS):
+            self.logger.warning("🤖 Captcha detectado")
+            return True
         
         return False
     
-    async def _check_login_success(self) -> bool:
-        """Verifica se o login foi bem-sucedido"""
-        
-        # Indicadores de sucesso
-        success_indicators = [
-            'accounts.google.com/b/0/ManageAccount',
-            'myaccount.google.com',
-            'text="Conta Google"',
-            'button[aria-label*="Conta"]',
-            'img[alt*="Avatar"]'
-        ]
+    async def _check_login_success(self) -> LoginResult:
+        """Verifica o resultado do envio da senha (SUCCESS, INVALID_CREDENTIALS ou FAILED)"""
         
-        # Indicadores de erro
-        error_indicators = [
-            'text="Senha incorreta"',
-            'text="Wrong password"',
-            'text="Couldn\'t sign in"',
-            'text="Não foi possível fazer login"',
-            'div[class*="error"]',
-            'div[class*="warning"]'
-        ]
-        
-        # Verifica erros primeiro
-        for indicator in error_indicators:
-            try:
-                error = await self.browser_manager.page.find(indicator, timeout=1000)
-                if error:
-                    print(f"❌ Erro de login detectado: {indicator}")
-                    return False
-            except:
-                continue
+        # Sinal mais barato primeiro: a URL já indica a conta logada
+        current_url = self.browser_manager.page.url or ""
+        if any(marker in current_url for marker in _LOGGED_IN_URL_MARKERS):
+            self.logger.debug(f"✅ Login bem-sucedido detectado pela URL: {current_url}")
+            return LoginResult.SUCCESS
         
-        # Verifica sucessos
-        for indicator in success_indicators:
-            try:
-                success = await self.browser_manager.page.find(indicator, timeout=3000)
-                if success:
-                    print(f"✅ Login bem-sucedido detectado: {indicator}")
-                    return True
-            except:
-                continue
+        # Erros e sucessos num único snapshot do DOM (erros têm prioridade), repetido
+        # por pouco tempo caso a página ainda não tenha renderizado nenhum dos dois
+        indicator = await self._wait_first_match_js(_ERROR_INDICATORS + _SUCCESS_INDICATORS,
+                                                    self.INDICATOR_WAIT_TIMEOUT)
+        if indicator in _ERROR_INDICATORS:
+            self.logger.debug(f"❌ Erro de login detectado: {indicator}")
+            return LoginResult.INVALID_CREDENTIALS
         
-        # Verifica URL atual
-        current_url = self.browser_manager.page.url
-        if any(domain in current_url for domain in ['myaccount.google.com', 'accounts.google.com/ManageAccount']):
-            return True
+        if indicator:
+            self.logger.debug(f"✅ Login bem-sucedido detectado: {indicator}")
+            return LoginResult.SUCCESS
         
-        return False
+        return LoginResult.FAILED
     
     async def _manual_assisted_login(self) -> LoginResult:
         """Login assistido manual"""
@@ -370,122 +580,163 @@ class YouTubeLoginHandler:
             manual_page = await self.browser_manager.browser.new_page()
             await manual_page.goto('https://accounts.google.com/signin')
             
-            # Aguarda login manual
-            print("\n⏳ Aguardando login manual...")
-            input("▶️  Pressione ENTER após fazer login manualmente: ")
+            # Aguarda ENTER no terminal ou a detecção do login na própria aba
+            self.logger.info("⏳ Aguardando login manual...")
+            enter = asyncio.create_task(self._wait_for_enter(
+                "▶️  Pressione ENTER após o login (ou aguarde a detecção automática): "))
+            poll = asyncio.create_task(self._poll_logged_in(manual_page))
+            try:
+                done, _ = await asyncio.wait({enter, poll}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in (enter, poll):
+                    waiter.cancel()
+                await asyncio.gather(enter, poll, return_exceptions=True)
             
             # Fecha aba manual
             await manual_page.close()
             
+            # Sondagem esgotou o prazo sem ENTER nem login detectado
+            if poll in done and not poll.result():
+                self.logger.warning("⌛ Tempo esgotado aguardando login manual")
+                return LoginResult.FAILED
+            
             # Navega para YouTube na aba principal
             await self.browser_manager.navigate_safely('https://www.youtube.com')
+            self._login_state_cache = None
             
             # Verifica se está logado
             if await self._is_logged_in():
-                print("🎉 Login manual realizado com sucesso!")
+                self.logger.info("🎉 Login manual realizado com sucesso!")
                 return LoginResult.SUCCESS
             else:
-                print("❌ Login manual não detectado")
+                self.logger.warning("❌ Login manual não detectado")
                 return LoginResult.FAILED
                 
         except Exception as e:
-            print(f"❌ Erro no login manual: {e}")
+            self.logger.error(f"❌ Erro no login manual: {e}")
             return LoginResult.FAILED
     
-    async def _is_logged_in(self) -> bool:
-        """Verifica se está logado no YouTube"""
+    async def _wait_for_enter(self, prompt: str) -> str:
+        """Aguarda uma linha do terminal sem bloquear o loop nem deixar thread presa em input()"""
+        loop = asyncio.get_running_loop()
+        line = loop.create_future()
         
-        login_indicators = [
-            'button[aria-label*="Conta do Google"]',
-            'button[aria-label*="conta"]',
-            'img[id="avatar-btn"]',
-            'button[id="avatar-btn"]',
-            'yt-img-shadow[id="avatar"]',
-            '[aria-label*="Avatar"]'
-        ]
+        def deliver(text):
+            if not line.done():
+                line.set_result(text)
         
-        for indicator in login_indicators:
-            try:
-                element = await self.browser_manager.page.find(indicator, timeout=3000)
-                if element:
-                    print(f"✅ Login detectado: {indicator}")
-                    return True
-            except:
-                continue
+        print(prompt, end="", flush=True)
+        try:
+            fd = sys.stdin.fileno()
+            loop.add_reader(fd, lambda: deliver(sys.stdin.readline()))
+        except (NotImplementedError, AttributeError, OSError, ValueError):
+            # Sem add_reader (Windows/stdin sem descritor): thread daemon não segura a saída do processo
+            def read():
+                text = sys.stdin.readline()
+                try:
+                    loop.call_soon_threadsafe(deliver, text)
+                except RuntimeError:
+                    pass  # loop já encerrado
+            
+            threading.Thread(target=read, daemon=True).start()
+            return await line
         
-        # Verifica se há botão de "Fazer login"
-        signin_buttons = [
-            'a:has-text("Fazer login")',
-            'a:has-text("Sign in")',
-            'paper-button:has-text("FAZER LOGIN")'
-        ]
+        try:
+            return await line
+        finally:
+            # Cancelado ou não, o stdin volta a ser de quem vier depois
+            loop.remove_reader(fd)
+    
+    async def _poll_logged_in(self, page, interval: float = 2.0, timeout: float = 300) -> bool:
+        """Consulta a URL da aba de login até o Google redirecionar para a conta"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while asyncio.get_running_loop().time() < deadline:
+            url = page.url or ""
+            if any(marker in url for marker in _LOGGED_IN_URL_MARKERS):
+                self.logger.debug(f"✅ Login manual detectado pela URL: {url}")
+                return True
+            await asyncio.sleep(interval)
+        return False
+    
+    async def _logged_in_within(self, timeout: float) -> bool:
+        """_is_logged_in limitado a timeout segundos (sem resposta conta como não logado)"""
+        probe = asyncio.create_task(self._is_logged_in())
+        done, _ = await asyncio.wait({probe}, timeout=timeout)
+        if probe in done and not probe.cancelled() and probe.exception() is None:
+            return probe.result()
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        return False
+    
+    async def _is_logged_in(self) -> bool:
+        """Verifica se está logado no YouTube (reaproveita a resposta recente para a mesma URL)"""
+        url = self.browser_manager.page.url or ""
+        cached = self._login_state_cache
+        if cached and cached[0] == url and time.monotonic() - cached[1] < self.LOGIN_STATE_TTL:
+            return cached[2]
+        
+        logged_in = await self._probe_logged_in()
+        self._login_state_cache = (url, time.monotonic(), logged_in)
+        return logged_in
+    
+    async def _probe_logged_in(self) -> bool:
+        """Consulta URL e DOM para decidir se está logado"""
         
-        for button in signin_buttons:
-            try:
-                element = await self.browser_manager.page.find(button, timeout=2000)
-                if element:
-                    print("📝 Botão de login encontrado - não está logado")
-                    return False
-            except:
-                continue
+        # URL decide sem consultar o DOM quando não é ambígua
+        url = self.browser_manager.page.url or ""
+        if any(marker in url for marker in _LOGGED_OUT_URL_MARKERS):
+            self.logger.debug("📝 Página de login do Google - não está logado")
+            return False
+        if any(marker in url for marker in _LOGGED_IN_URL_MARKERS):
+            self.logger.debug(f"✅ Login detectado pela URL: {url}")
+            return True
         
-        print("🤔 Status de login incerto")
+        # Avatar e botão "Fazer login" num único snapshot do DOM; com o header ainda
+        # não renderizado, repete por pouco tempo até um dos dois aparecer
+        indicator = await self._wait_first_match_js(_LOGGED_IN_INDICATORS + _SIGNIN_INDICATORS,
+                                                    self.INDICATOR_WAIT_TIMEOUT)
+        if indicator in _SIGNIN_INDICATORS:
+            self.logger.debug("📝 Botão de login encontrado - não está logado")
+            return False
+        
+        if indicator:
+            self.logger.debug(f"✅ Login detectado: {indicator}")
+            return True
+        
+        self.logger.debug("🤔 Status de login incerto")
         return False
     
     async def logout(self) -> bool:
         """Faz logout da conta"""
         try:
-            print("🚪 Fazendo logout...")
+            self.logger.info("🚪 Fazendo logout...")
             
             # Clica no avatar
-            avatar_selectors = [
-                'button[id="avatar-btn"]',
-                'yt-img-shadow[id="avatar"]',
-                'button[aria-label*="conta"]'
-            ]
-            
-            avatar = None
-            for selector in avatar_selectors:
-                try:
-                    avatar = await self.browser_manager.page.find(selector, timeout=3000)
-                    if avatar:
-                        break
-                except:
-                    continue
+            avatar = await self._first_matching_selector(_AVATAR_SELECTORS, timeout=3)
             
             if not avatar:
-                print("❌ Avatar não encontrado para logout")
+                self.logger.warning("❌ Avatar não encontrado para logout")
                 return False
             
             await self.human_simulator.human_click(self.browser_manager.page, avatar)
-            await asyncio.sleep(random.uniform(1.0, 2.0))
+            await self._wait_ready()
             
             # Clica em "Sair"
-            logout_selectors = [
-                'a:has-text("Sair")',
-                'a:has-text("Sign out")',
-                'yt-formatted-string:has-text("Sair")'
-            ]
-            
-            logout_button = None
-            for selector in logout_selectors:
-                try:
-                    logout_button = await self.browser_manager.page.find(selector, timeout=3000)
-                    if logout_button:
-                        break
-                except:
-                    continue
+            logout_button = await self._first_matching_selector(_LOGOUT_SELECTORS, timeout=3)
             
             if logout_button:
                 await self.human_simulator.human_click(self.browser_manager.page, logout_button)
-                await asyncio.sleep(random.uniform(2.0, 4.0))
+                self._login_state_cache = None
+                await self._wait_ready()
                 
-                print("✅ Logout realizado com sucesso")
+                self.credential_manager.invalidate()
+                self._session_cache = None
+                self.logger.info("✅ Logout realizado com sucesso")
                 return True
             else:
-                print("❌ Botão de logout não encontrado")
+                self.logger.warning("❌ Botão de logout não encontrado")
                 return False
                 
         except Exception as e:
-            print(f"❌ Erro durante logout: {e}")
+            self.logger.error(f"❌ Erro durante logout: {e}")
             return False
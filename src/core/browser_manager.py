@@ -6,7 +6,6 @@ Gerenciador avançado de browser com recursos de stealth e anti-detecção.
 """
 
 import asyncio
-import os
 import json
 import random
 from typing import Optional, Dict, Any, List
@@ -19,24 +18,40 @@ except ImportError:
     uc = None
 
 from ..security.fingerprint_spoofing import AdvancedStealthEngine, ContextRotator
+from .stealth_factory import get_browser, connect_browser, profile_dir
+from ..utils.logger import AutomationLogger, get_logger
+
+
+SCREENSHOTS_DIR = Path("temp_screenshots")
+_dir_ready = False
+
+
+def _ensure_screenshots_dir() -> Path:
+    """Cria o diretório de screenshots só na primeira chamada"""
+    global _dir_ready
+    if not _dir_ready:
+        SCREENSHOTS_DIR.mkdir(exist_ok=True)
+        _dir_ready = True
+    return SCREENSHOTS_DIR
 
 
 class BrowserManager:
     """Gerenciador avançado de browser stealth"""
     
-    def __init__(self, profile_name: str = "default"):
+    def __init__(self, profile_name: str = "default", logger: AutomationLogger = None):
         self.profile_name = profile_name
+        # Mesmo logger (fila única) da aplicação: prints fora da fila saíam fora de ordem
+        self.logger = logger or get_logger()
         self.browser = None
         self.page = None
+        self.attached = False
         self.stealth_engine = AdvancedStealthEngine()
         self.context_rotator = ContextRotator()
         self.profile_dir = self._get_profile_directory()
         
     def _get_profile_directory(self) -> str:
         """Retorna diretório do profile"""
-        profiles_dir = Path("browser_profiles")
-        profiles_dir.mkdir(exist_ok=True)
-        return str(profiles_dir / self.profile_name)
+        return str(profile_dir(self.profile_name))
     
     async def launch_stealth_browser(self, headless: bool = False, 
                                    context_rotation: bool = True) -> tuple:
@@ -49,9 +64,9 @@ class BrowserManager:
             # Seleciona contexto (rotação ou aleatório)
             if context_rotation:
                 context = self.context_rotator.get_next_context()
-                profile_dir = os.path.join(self.profile_dir, context['profile_dir'])
+                profile_name = f"{self.profile_name}/{context['profile_dir']}"
             else:
-                profile_dir = self.profile_dir
+                profile_name = self.profile_name
             
             # Configurações stealth do browser
             stealth_args = self.stealth_engine.get_stealth_browser_args()
@@ -79,14 +94,11 @@ class BrowserManager:
             
             all_args = stealth_args + custom_args
             
-            print(f"🚀 Lançando browser stealth (Profile: {profile_dir})")
+            self.logger.info(f"🚀 Lançando browser stealth (Profile: {profile_dir(profile_name)})")
             
-            # Lança browser
-            self.browser = await uc.start(
-                headless=headless,
-                user_data_dir=profile_dir,
-                args=all_args
-            )
+            # Lança browser pela factory: flags canônicas + extras deste gerenciador
+            self.browser = await get_browser(profile_name, headless=headless,
+                                             extra_args=tuple(all_args))
             
             # Obtém página principal
             self.page = await self.browser.get('about:blank')
@@ -97,11 +109,28 @@ class BrowserManager:
             # Configura fingerprint do browser
             await self._setup_browser_fingerprint(fingerprint)
             
-            print("✅ Browser stealth configurado com sucesso")
+            self.logger.info("✅ Browser stealth configurado com sucesso")
+            return self.browser, self.page
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao lançar browser: {e}")
+            raise
+    
+    async def attach(self, endpoint: str = None) -> tuple:
+        """Reaproveita o browser do modo --daemon abrindo uma aba nova nele"""
+        try:
+            self.browser = await connect_browser(endpoint)
+            self.attached = True
+            
+            # Aba própria: o browser e suas outras abas pertencem ao daemon
+            self.page = await self.browser.get('about:blank', new_tab=True)
+            await self.stealth_engine.inject_stealth_scripts(self.page)
+            
+            self.logger.info("🔌 Conectado ao browser stealth em execução")
             return self.browser, self.page
             
         except Exception as e:
-            print(f"❌ Erro ao lançar browser: {e}")
+            self.logger.error(f"❌ Erro ao conectar ao browser: {e}")
             raise
     
     async def _setup_browser_fingerprint(self, fingerprint: Dict[str, Any]):
@@ -155,14 +184,20 @@ class BrowserManager:
             }});
         """)
     
+    @staticmethod
+    def pre_navigation_delay() -> float:
+        """Pausa humana (s) antes de cada navegação"""
+        return random.uniform(1.0, 3.0)
+    
     async def navigate_safely(self, url: str, wait_for: str = "domcontentloaded",
-                            timeout: int = 30000) -> bool:
-        """Navega para URL com verificações de segurança"""
+                            timeout: int = 30000, human_delay: bool = True) -> bool:
+        """Navega para URL com verificações de segurança (human_delay=False se o chamador já fez a pausa)"""
         try:
-            print(f"🌐 Navegando para: {url}")
+            self.logger.info(f"🌐 Navegando para: {url}")
             
             # Adiciona delay humano antes da navegação
-            await asyncio.sleep(random.uniform(1.0, 3.0))
+            if human_delay:
+                await asyncio.sleep(self.pre_navigation_delay())
             
             # Navega para a URL
             await self.page.goto(url, wait_until=wait_for, timeout=timeout)
@@ -173,13 +208,28 @@ class BrowserManager:
             # Pequena pausa após carregamento
             await asyncio.sleep(random.uniform(2.0, 4.0))
             
-            print("✅ Navegação concluída com sucesso")
+            self.logger.info("✅ Navegação concluída com sucesso")
             return True
             
         except Exception as e:
-            print(f"❌ Erro na navegação: {e}")
+            self.logger.error(f"❌ Erro na navegação: {e}")
             return False
     
+    async def navigate_and_check(self, url: str, probe_js: str, wait_for: str = "domcontentloaded",
+                                 timeout: int = 30000):
+        """Navega e avalia probe_js assim que o DOM fica pronto; retorna o resultado ou None"""
+        try:
+            self.logger.info(f"🌐 Navegando para: {url}")
+            
+            # Mesmo delay humano antes da navegação; a pausa pós-carga fica a cargo do chamador
+            await asyncio.sleep(self.pre_navigation_delay())
+            await self.page.goto(url, wait_until=wait_for, timeout=timeout)
+            return await self.page.evaluate(probe_js)
+            
+        except Exception as e:
+            self.logger.error(f"❌ Erro na navegação: {e}")
+            return None
+    
     async def _verify_page_load(self):
         """Verifica se a página carregou adequadamente"""
         try:
@@ -199,13 +249,13 @@ class BrowserManager:
                 try:
                     error_element = await self.page.find(indicator, timeout=1000)
                     if error_element:
-                        print(f"⚠️  Possível erro detectado na página: {indicator}")
+                        self.logger.warning(f"⚠️  Possível erro detectado na página: {indicator}")
                         break
                 except:
                     continue  # Sem erro encontrado, continua
                     
         except Exception as e:
-            print(f"⚠️  Não foi possível verificar carregamento da página: {e}")
+            self.logger.warning(f"⚠️  Não foi possível verificar carregamento da página: {e}")
     
     async def take_screenshot(self, filename: str = None, full_page: bool = False) -> str:
         """Captura screenshot com nome automático"""
@@ -214,8 +264,7 @@ class BrowserManager:
                 timestamp = int(asyncio.get_event_loop().time())
                 filename = f"screenshot_{timestamp}.png"
             
-            screenshots_dir = Path("temp_screenshots")
-            screenshots_dir.mkdir(exist_ok=True)
+            screenshots_dir = _ensure_screenshots_dir()
             
             screenshot_path = screenshots_dir / filename
             
@@ -224,11 +273,11 @@ class BrowserManager:
                 full_page=full_page
             )
             
-            print(f"📸 Screenshot salvo: {screenshot_path}")
+            self.logger.info(f"📸 Screenshot salvo: {screenshot_path}")
             return str(screenshot_path)
             
         except Exception as e:
-            print(f"❌ Erro ao capturar screenshot: {e}")
+            self.logger.error(f"❌ Erro ao capturar screenshot: {e}")
             return ""
     
     async def get_page_info(self) -> Dict[str, Any]:
@@ -245,7 +294,7 @@ class BrowserManager:
             }
             return info
         except Exception as e:
-            print(f"❌ Erro ao obter informações da página: {e}")
+            self.logger.error(f"❌ Erro ao obter informações da página: {e}")
             return {}
     
     async def clear_browser_data(self, clear_cookies: bool = True, 
@@ -264,10 +313,10 @@ class BrowserManager:
                 for cookie in cookies:
                     await self.page.delete_cookie(cookie['name'])
             
-            print("🧹 Dados do browser limpos")
+            self.logger.info("🧹 Dados do browser limpos")
             
         except Exception as e:
-            print(f"❌ Erro ao limpar dados: {e}")
+            self.logger.error(f"❌ Erro ao limpar dados: {e}")
     
     async def close_browser(self, save_session: bool = True):
         """Fecha browser com opção de salvar sessão"""
@@ -286,14 +335,49 @@ class BrowserManager:
                 with open(session_file, 'w') as f:
                     json.dump(session_data, f, indent=2)
                 
-                print("💾 Sessão salva")
-            
-            if self.browser:
+                self.logger.info("💾 Sessão salva")
+            
+            if self.attached:
+                # O browser continua vivo para os próximos --connect
+                if self.page:
+                    await self.page.close()
+                self.logger.info("🔌 Aba fechada (browser do daemon mantido)")
+            elif self.browser:
                 await self.browser.close()
-                print("🔒 Browser fechado")
+                self.logger.info("🔒 Browser fechado")
                 
         except Exception as e:
-            print(f"❌ Erro ao fechar browser: {e}")
+            self.logger.error(f"❌ Erro ao fechar browser: {e}")
+    
+    async def wait_until_closed(self) -> str:
+        """Aguarda por eventos CDP (sem polling) a aba fechar, cair ou cair no login do Google"""
+        done = asyncio.Event()
+        reason = []
+        
+        def on_detached(event):
+            reason.append("closed")
+            done.set()
+        
+        def on_navigated(event):
+            # Só o frame principal: redirecionamento para o login = sessão perdida
+            if event.frame.parent_id is None and "accounts.google.com" in event.frame.url:
+                reason.append("session_lost")
+                done.set()
+        
+        handlers = (
+            (uc.cdp.inspector.Detached, on_detached),
+            (uc.cdp.inspector.TargetCrashed, on_detached),
+            (uc.cdp.page.FrameNavigated, on_navigated),
+        )
+        for event_type, handler in handlers:
+            self.page.add_handler(event_type, handler)
+        try:
+            await self.page.send(uc.cdp.inspector.enable())
+            await done.wait()
+            return reason[0]
+        finally:
+            for event_type, handler in handlers:
+                self.page.remove_handler(event_type, handler)
     
     async def restore_session(self) -> bool:
         """Restaura sessão anterior"""
@@ -301,7 +385,7 @@ class BrowserManager:
             session_file = Path(self.profile_dir) / "last_session.json"
             
             if not session_file.exists():
-                print("📝 Nenhuma sessão anterior encontrada")
+                self.logger.info("📝 Nenhuma sessão anterior encontrada")
                 return False
             
             with open(session_file, 'r') as f:
@@ -312,7 +396,7 @@ class BrowserManager:
             session_age = current_time - session_data.get('timestamp', 0)
             
             if session_age > 86400:  # 24 horas
-                print("⏰ Sessão muito antiga, iniciando nova sessão")
+                self.logger.info("⏰ Sessão muito antiga, iniciando nova sessão")
                 return False
             
             # Restaura cookies
@@ -323,11 +407,11 @@ class BrowserManager:
             if 'url' in session_data and session_data['url'] != 'about:blank':
                 await self.navigate_safely(session_data['url'])
             
-            print("🔄 Sessão restaurada com sucesso")
+            self.logger.info("🔄 Sessão restaurada com sucesso")
             return True
             
         except Exception as e:
-            print(f"❌ Erro ao restaurar sessão: {e}")
+            self.logger.error(f"❌ Erro ao restaurar sessão: {e}")
             return False
     
     def __enter__(self):
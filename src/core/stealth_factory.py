@@ -0,0 +1,138 @@
+"""
+Stealth Factory - Inicialização Única do Browser Stealth
+========================================================
+
+Ponto único de criação do browser para todos os entrypoints: mesmas flags,
+mesmo idioma e o mesmo user_data_dir por profile, de modo que o cache em
+disco (HTTP, Service Workers, shaders) já esteja quente a partir da segunda
+execução e o fingerprint se mantenha consistente entre execuções.
+"""
+
+import asyncio
+import functools
+import os
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import nodriver as uc
+except ImportError:
+    print("⚠️  nodriver não encontrado. Execute: pip install nodriver")
+    uc = None
+
+
+PROFILE_ROOT = Path("browser_profiles")
+CHROMIUM_PATH = "/usr/bin/chromium-browser"
+# host:port do browser mantido vivo pelo modo --daemon
+ENDPOINT_FILE = Path.home() / ".yt_automation" / "endpoint"
+
+# Lista canônica de flags - --no-sandbox e --remote-debugging-port já são adicionados pelo nodriver
+STEALTH_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    # Recursos com threads/requisições em background inúteis aqui
+    "--disable-features=Translate,MediaRouter,OptimizationHints,"
+    "InterestFeedContentSuggestions,AcceptCHFrame",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--mute-audio",
+)
+
+# Switches de lista: o Chromium só respeita a última ocorrência, então os valores são unidos
+LIST_SWITCHES = ("--disable-features", "--enable-features", "--disable-blink-features")
+
+
+def profile_dir(profile_name: str) -> Path:
+    """Diretório persistente do profile (compartilhado entre entrypoints)"""
+    return PROFILE_ROOT / profile_name
+
+
+def merge_browser_args(base: Iterable[str], extra: Iterable[str] = ()) -> List[str]:
+    """Uma ocorrência por switch: listas (--disable-features e afins) são unidas, nos demais vale o último valor"""
+    # switch -> valor (None para flags sem "="); dict preserva a posição da primeira ocorrência
+    merged: Dict[str, Any] = {}
+    for arg in (*base, *extra):
+        switch, sep, value = arg.partition("=")
+        if switch in LIST_SWITCHES:
+            values = merged.setdefault(switch, [])
+            values.extend(v for v in value.split(",") if v and v not in values)
+        else:
+            merged[switch] = value if sep else None
+    return [
+        switch if value is None
+        else f"{switch}={','.join(value) if isinstance(value, list) else value}"
+        for switch, value in merged.items()
+    ]
+
+
+@functools.cache
+def browser_config(profile_name: str = "default", headless: bool = True) -> Dict[str, Any]:
+    """Monta (uma vez por profile/modo) os kwargs canônicos de uc.start"""
+    user_data_dir = profile_dir(profile_name)
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+
+    config = {
+        "headless": headless,
+        "no_sandbox": True,
+        "user_data_dir": str(user_data_dir),
+        "lang": "pt-BR",
+        "browser_args": list(STEALTH_ARGS),
+    }
+    executable = os.getenv("CHROMIUM_PATH", CHROMIUM_PATH)
+    if os.path.exists(executable):
+        config["browser_executable_path"] = executable
+    return config
+
+
+async def get_browser(profile_name: str = "default", headless: bool = True,
+                      extra_args: Tuple[str, ...] = ()):
+    """Inicia o browser stealth com a configuração canônica do profile"""
+    if uc is None:
+        raise ImportError("nodriver não está disponível")
+
+    config = browser_config(profile_name, headless)
+    # Extras por execução (UA, window-size aleatórios) ficam fora do cache; a lista
+    # nova também protege o cache do nodriver, que pode acrescentar flags in-place
+    args = merge_browser_args(config["browser_args"], extra_args)
+    return await uc.start(**{**config, "browser_args": args})
+
+
+async def connect_browser(endpoint: str = None):
+    """Conecta a um browser já em execução (host:port; padrão: ENDPOINT_FILE)"""
+    if uc is None:
+        raise ImportError("nodriver não está disponível")
+
+    if not endpoint:
+        try:
+            endpoint = ENDPOINT_FILE.read_text().strip()
+        except FileNotFoundError:
+            raise ConnectionError(f"{ENDPOINT_FILE} não existe - inicie antes um browser com --daemon") from None
+    host, port = endpoint.rsplit(":", 1)
+
+    # Arquivo de um daemon já encerrado: falha clara em vez de um erro do nodriver
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), timeout=2)
+        writer.close()
+    except (OSError, asyncio.TimeoutError):
+        raise ConnectionError(
+            f"Nenhum browser respondendo em {endpoint} (endpoint desatualizado?) - reinicie o --daemon"
+        ) from None
+
+    # Com host e port o nodriver se conecta ao DevTools existente em vez de lançar o Chromium
+    return await uc.start(host=host, port=int(port))
+
+
+def write_endpoint(browser) -> str:
+    """Publica o host:port em que o browser realmente escuta em ENDPOINT_FILE para o --connect"""
+    # URL do DevTools do processo em execução, não a porta pedida na configuração
+    debugger = urlsplit(browser.websocket_url)
+    endpoint = f"{debugger.hostname}:{debugger.port}"
+    ENDPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ENDPOINT_FILE.write_text(endpoint)
+    return endpoint
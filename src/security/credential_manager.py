@@ -6,6 +6,7 @@ Sistema seguro para gerenciamento de credenciais com criptografia.
 """
 
 import os
+import time
 import base64
 import json
 from typing import Optional, Dict, Any
@@ -19,11 +20,16 @@ import getpass
 class CredentialManager:
     """Gerenciador seguro de credenciais"""
     
+    # Tempo (s) que as credenciais já resolvidas ficam em memória
+    CACHE_TTL = 300
+    
     def __init__(self, master_password: Optional[str] = None):
         self.master_password = master_password
         self.credentials_file = ".credentials.enc"
         self.salt_file = ".salt"
         self._cipher = None
+        self._cached_credentials = None
+        self._cache_expiry = 0.0
         
     def _generate_key(self, password: str, salt: bytes) -> bytes:
         """Gera chave de criptografia a partir da senha mestre"""
@@ -62,7 +68,7 @@ class CredentialManager:
             credentials = {
                 "youtube_email": youtube_email,
                 "youtube_password": youtube_password,
-                "created_at": str(os.time())
+                "created_at": str(time.time())
             }
             
             cipher = self._get_cipher()
@@ -71,6 +77,7 @@ class CredentialManager:
             with open(self.credentials_file, 'wb') as f:
                 f.write(encrypted_data)
             
+            self.invalidate()
             print("✅ Credenciais armazenadas com segurança")
             return True
             
@@ -150,6 +157,18 @@ class CredentialManager:
         return None
     
     def get_credentials(self) -> Optional[Dict[str, str]]:
+        """Obtém credenciais (cache em memória por CACHE_TTL segundos)"""
+        now = time.monotonic()
+        if self._cached_credentials and now < self._cache_expiry:
+            return self._cached_credentials
+        
+        creds = self._resolve_credentials()
+        if creds:
+            self._cached_credentials = creds
+            self._cache_expiry = now + self.CACHE_TTL
+        return creds
+    
+    def _resolve_credentials(self) -> Optional[Dict[str, str]]:
         """Obtém credenciais por ordem de prioridade"""
         
         # 1. Tenta carregar credenciais criptografadas
@@ -170,6 +189,11 @@ class CredentialManager:
         
         return None
     
+    def invalidate(self):
+        """Descarta as credenciais em cache (logout, troca ou remoção)"""
+        self._cached_credentials = None
+        self._cache_expiry = 0.0
+    
     def remove_credentials(self) -> bool:
         """Remove credenciais armazenadas"""
         try:
@@ -178,6 +202,7 @@ class CredentialManager:
             if os.path.exists(self.salt_file):
                 os.remove(self.salt_file)
             
+            self.invalidate()
             print("✅ Credenciais removidas com segurança")
             return True
             
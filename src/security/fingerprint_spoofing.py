@@ -133,14 +133,10 @@ class AdvancedStealthEngine:
     async def inject_stealth_scripts(self, page) -> None:
         """Injeta scripts de stealth para mascarar automação"""
         
-        # Remove detecção de webdriver
+        # navigator.webdriver não é mais sobrescrito aqui: a flag
+        # --disable-blink-features=AutomationControlled (get_stealth_browser_args)
+        # já faz o Chrome reportar false, sem o "undefined" que denuncia o patch
         await page.evaluate("""
-            // Remove webdriver property
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined,
-            });
-            delete navigator.__proto__.webdriver;
-            
             // Mock plugins
             Object.defineProperty(navigator, 'plugins', {
                 get: () => [
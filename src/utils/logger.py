@@ -5,10 +5,12 @@ Logger - Sistema de Logs Estruturado
 Sistema avançado de logging com múltiplos níveis e formatação estruturada.
 """
 
+import atexit
 import logging
 import logging.handlers
 import json
 import os
+import queue
 import sys
 import asyncio
 from datetime import datetime
@@ -72,6 +74,13 @@ class StructuredFormatter(logging.Formatter):
         return json.dumps(log_entry, ensure_ascii=False)
 
 
+class PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que enfileira o registro intacto: formatação e exc_info ficam com os handlers do listener"""
+    
+    def prepare(self, record):
+        return record
+
+
 class AutomationLogger:
     """Logger personalizado para automação"""
     
@@ -98,10 +107,31 @@ class AutomationLogger:
         self._setup_console_handler()
         self._setup_file_handler(max_bytes, backup_count)
         self._setup_error_file_handler(max_bytes, backup_count)
+        self._setup_queue()
         
         # Evita propagação para root logger
         self.logger.propagate = False
     
+    def _setup_queue(self):
+        """Move os handlers para uma thread: log no event loop só enfileira o registro"""
+        handlers = list(self.logger.handlers)
+        self.logger.handlers.clear()
+        
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(PassthroughQueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        # Garante que registros ainda na fila sejam escritos na saída do processo
+        atexit.register(self.stop)
+    
+    def stop(self):
+        """Esvazia a fila e encerra a thread de escrita"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
     def _setup_console_handler(self):
         """Configura handler para console com cores"""
         console_handler = logging.StreamHandler(sys.stdout)
@@ -277,7 +307,9 @@ class LogManager:
     def shutdown_all(cls):
         """Encerra todos os loggers"""
         for logger in cls._loggers.values():
-            for handler in logger.logger.handlers:
+            handlers = list(logger._listener.handlers) if logger._listener else []
+            logger.stop()
+            for handler in handlers + logger.logger.handlers:
                 handler.close()
         
         cls._loggers.clear()
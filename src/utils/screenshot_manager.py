@@ -5,6 +5,7 @@ Screenshot Manager - Gerenciador Avançado de Screenshots
 Sistema avançado para captura, organização e análise de screenshots.
 """
 
+import asyncio
 import os
 import time
 import hashlib
@@ -231,10 +232,13 @@ class ScreenshotManager:
         
         try:
             for screenshot_dir in [self.base_dir] + list(self.subdirs.values()):
-                for file_path in screenshot_dir.glob("*.png"):
-                    if file_path.stat().st_mtime < cutoff_date:
-                        file_path.unlink()
-                        removed_count += 1
+                # scandir traz o stat junto com a entrada: um syscall por arquivo
+                with os.scandir(screenshot_dir) as entries:
+                    for entry in entries:
+                        if (entry.name.endswith(".png") and entry.is_file()
+                                and entry.stat().st_mtime < cutoff_date):
+                            os.remove(entry.path)
+                            removed_count += 1
             
             # Remove metadados correspondentes
             self.metadata = [m for m in self.metadata 
@@ -247,6 +251,10 @@ class ScreenshotManager:
             self.logger.error(f"❌ Erro na limpeza: {e}")
             return 0
     
+    async def cleanup_old_screenshots_async(self, days_old: int = 7) -> int:
+        """Remove screenshots antigos numa thread, sem bloquear o event loop"""
+        return await asyncio.to_thread(self.cleanup_old_screenshots, days_old)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Estatísticas dos screenshots"""
         if not self.metadata:
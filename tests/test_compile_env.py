@@ -0,0 +1,121 @@
+"""
+Testes para Compile Env
+=======================
+
+Testes unitários para o cache do .env e para a verificação de credenciais.
+"""
+
+import pytest
+import json
+import os
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import compile_env
+import check_credentials
+
+
+@pytest.fixture
+def env_paths(tmp_path, monkeypatch):
+    """Aponta ENV_FILE/CACHE_FILE para um diretório temporário"""
+    env_file = tmp_path / ".env"
+    cache_file = tmp_path / "env_cache.json"
+    monkeypatch.setattr(compile_env, "ENV_FILE", env_file)
+    monkeypatch.setattr(compile_env, "CACHE_FILE", cache_file)
+    monkeypatch.delenv("COMPILE_ENV_TESTE", raising=False)
+    return env_file, cache_file
+
+
+def set_mtime(path: Path, mtime: float):
+    """Força o mtime do arquivo"""
+    os.utime(path, (mtime, mtime))
+
+
+class TestCompileEnv:
+    """Testes para compile_env/load_env"""
+
+    def test_compile_writes_private_json(self, env_paths):
+        """Testa que o cache é JSON legível só pelo dono"""
+        env_file, cache_file = env_paths
+        env_file.write_text("COMPILE_ENV_TESTE=valor\n")
+
+        assert compile_env.compile_env() == {"COMPILE_ENV_TESTE": "valor"}
+        assert json.loads(cache_file.read_text()) == {"COMPILE_ENV_TESTE": "valor"}
+        assert cache_file.stat().st_mode & 0o777 == 0o600
+
+    def test_fresh_cache_is_used(self, env_paths):
+        """Testa que cache mais novo que o .env é lido no lugar do .env"""
+        env_file, cache_file = env_paths
+        env_file.write_text("COMPILE_ENV_TESTE=do_env\n")
+        cache_file.write_text(json.dumps({"COMPILE_ENV_TESTE": "do_cache"}))
+        set_mtime(env_file, 1000)
+        set_mtime(cache_file, 2000)
+
+        assert compile_env.load_env()["COMPILE_ENV_TESTE"] == "do_cache"
+
+    def test_stale_cache_falls_back_to_env(self, env_paths):
+        """Testa que .env editado depois do cache vence"""
+        env_file, cache_file = env_paths
+        env_file.write_text("COMPILE_ENV_TESTE=do_env\n")
+        cache_file.write_text(json.dumps({"COMPILE_ENV_TESTE": "do_cache"}))
+        set_mtime(cache_file, 1000)
+        set_mtime(env_file, 2000)
+
+        assert compile_env.load_env()["COMPILE_ENV_TESTE"] == "do_env"
+
+    def test_invalid_cache_falls_back_to_env(self, env_paths):
+        """Testa que cache com formato inesperado é ignorado"""
+        env_file, cache_file = env_paths
+        env_file.write_text("COMPILE_ENV_TESTE=do_env\n")
+        cache_file.write_text(json.dumps(["COMPILE_ENV_TESTE", "do_cache"]))
+        set_mtime(env_file, 1000)
+        set_mtime(cache_file, 2000)
+
+        assert compile_env.load_env()["COMPILE_ENV_TESTE"] == "do_env"
+
+    def test_real_environment_wins(self, env_paths, monkeypatch):
+        """Testa que o cache não sobrescreve variáveis já definidas"""
+        env_file, cache_file = env_paths
+        env_file.write_text("")
+        cache_file.write_text(json.dumps({"COMPILE_ENV_TESTE": "do_cache"}))
+        set_mtime(env_file, 1000)
+        set_mtime(cache_file, 2000)
+        monkeypatch.setenv("COMPILE_ENV_TESTE", "real")
+
+        assert compile_env.load_env()["COMPILE_ENV_TESTE"] == "real"
+
+
+class TestCheckCredentials:
+    """Testes para check_credentials"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        check_credentials._read_credentials.cache_clear()
+        yield
+        check_credentials._read_credentials.cache_clear()
+
+    @pytest.mark.parametrize("email,password", [
+        ("seu.email@gmail.com", "senhaReal123"),
+        ("usuario@gmail.com", "suaSenhaSegura"),
+        ("usuario@gmail.com", ""),
+    ])
+    def test_placeholders_are_rejected(self, monkeypatch, email, password):
+        """Testa que valores vazios ou do .env.example não contam como configurados"""
+        monkeypatch.setenv("YOUTUBE_EMAIL", email)
+        monkeypatch.setenv("YOUTUBE_PASSWORD", password)
+
+        assert check_credentials.check_credentials() is False
+
+    def test_real_credentials_are_accepted(self, monkeypatch):
+        """Testa credenciais preenchidas"""
+        monkeypatch.setenv("YOUTUBE_EMAIL", "usuario@gmail.com")
+        monkeypatch.setenv("YOUTUBE_PASSWORD", "senhaReal123")
+
+        assert check_credentials.check_credentials() is True
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])
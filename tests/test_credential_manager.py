@@ -0,0 +1,81 @@
+"""
+Testes para Credential Manager
+==============================
+
+Testes unitários para o cache em memória das credenciais.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.security import credential_manager
+from src.security.credential_manager import CredentialManager
+
+CREDS = {"email": "usuario@gmail.com", "password": "senhaReal123"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio monotônico controlado pelo teste"""
+    now = [1000.0]
+    monkeypatch.setattr(credential_manager.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_manager(result=CREDS) -> CredentialManager:
+    """Manager com a resolução (arquivo/.env/interativa) trocada por um mock"""
+    manager = CredentialManager()
+    manager._resolve_credentials = Mock(return_value=result)
+    return manager
+
+
+class TestCredentialCache:
+    """Testes para get_credentials/invalidate"""
+
+    def test_cached_within_ttl(self, clock):
+        """Testa que chamadas dentro do TTL não resolvem de novo"""
+        manager = make_manager()
+
+        assert manager.get_credentials() == CREDS
+        clock[0] += manager.CACHE_TTL - 1
+        assert manager.get_credentials() == CREDS
+
+        manager._resolve_credentials.assert_called_once()
+
+    def test_expires_after_ttl(self, clock):
+        """Testa que o cache expira depois de CACHE_TTL segundos"""
+        manager = make_manager()
+
+        manager.get_credentials()
+        clock[0] += manager.CACHE_TTL
+        manager.get_credentials()
+
+        assert manager._resolve_credentials.call_count == 2
+
+    def test_invalidate_forces_new_lookup(self, clock):
+        """Testa que invalidate descarta o cache imediatamente"""
+        manager = make_manager()
+
+        manager.get_credentials()
+        manager.invalidate()
+        manager.get_credentials()
+
+        assert manager._resolve_credentials.call_count == 2
+
+    def test_missing_credentials_are_not_cached(self, clock):
+        """Testa que ausência de credenciais não fica em cache"""
+        manager = make_manager(result=None)
+
+        assert manager.get_credentials() is None
+        assert manager.get_credentials() is None
+
+        assert manager._resolve_credentials.call_count == 2
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])
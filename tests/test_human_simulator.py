@@ -0,0 +1,150 @@
+"""
+Testes para Human Behavior Simulator
+====================================
+
+Testes unitários para os planos pré-sorteados de digitação, scroll e mouse.
+"""
+
+import pytest
+import asyncio
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.automation.human_simulator import HumanBehaviorSimulator
+
+
+class FakeTab:
+    """Aba falsa que aplica os comandos CDP de teclado recebidos ao campo"""
+
+    def __init__(self, field):
+        self.field = field
+        self.sent = []
+
+    async def send(self, command):
+        request = next(command)
+        params = request["params"]
+        self.sent.append(request["method"])
+        if request["method"] == "Input.dispatchKeyEvent" and params["type"] == "rawKeyDown" \
+                and params.get("key") == "Backspace":
+            self.field.value = self.field.value[:-1]
+        elif request["method"] == "Input.insertText":
+            self.field.value += params["text"]
+
+
+class FakeField:
+    """Campo de texto falso: type() insere os caracteres como o browser faria"""
+
+    def __init__(self):
+        self.value = ""
+        self.tab = FakeTab(self)
+
+    async def apply(self, js):
+        self.value = ""
+
+    async def type(self, text, delay=0):
+        self.value += text
+
+
+def instant_simulator(random_value: float = 0.99) -> HumanBehaviorSimulator:
+    """Simulador sem pausas; random_value controla pausas/erros/voltas sorteados"""
+    simulator = HumanBehaviorSimulator()
+    simulator._uniform = lambda low, high: 0
+    simulator._randint = lambda low, high: low
+    simulator._random = lambda: random_value
+    return simulator
+
+
+class TestTypingPlan:
+    """Testes para _plan_typing e human_typing"""
+
+    def test_plan_reassembles_text(self):
+        """Testa que os trechos do plano formam exatamente o texto"""
+        simulator = HumanBehaviorSimulator()
+        text = "usuario.teste@gmail.com Senha!"
+
+        plan = simulator._plan_typing(text, simulate_mistakes=True)
+
+        assert "".join(segment for segment, _, _, _ in plan) == text
+        assert all(delay > 0 for _, delay, _, _ in plan)
+
+    def test_plan_groups_same_rhythm(self):
+        """Testa que caracteres de mesmo ritmo viram um único trecho"""
+        plan = instant_simulator()._plan_typing("abcdefgh", simulate_mistakes=False)
+
+        # Sem pausas, erros nem troca de ritmo: uma única chamada element.type
+        assert [segment for segment, _, _, _ in plan] == ["abcdefgh"]
+
+    def test_no_mistakes_when_disabled(self):
+        """Testa que simulate_mistakes=False nunca planeja erros"""
+        plan = instant_simulator(random_value=0)._plan_typing("senha123", simulate_mistakes=False)
+
+        assert all(mistake is None for _, _, _, mistake in plan)
+
+    @pytest.mark.asyncio
+    async def test_corrected_mistakes_leave_exact_text(self):
+        """Testa que cada erro é apagado com Backspace real e o campo termina com o texto certo"""
+        pytest.importorskip("nodriver")
+        simulator = instant_simulator(random_value=0)  # erro em todo caractere
+        field = FakeField()
+
+        await simulator.human_typing(field, "senha", simulate_mistakes=True)
+
+        assert field.value == "senha"
+
+    @pytest.mark.asyncio
+    async def test_fast_fill_is_single_insert_text(self):
+        """Testa que fast_fill zera o campo e insere o texto num único comando CDP"""
+        pytest.importorskip("nodriver")
+        field = FakeField()
+        field.value = "antigo"
+
+        await HumanBehaviorSimulator.fast_fill(field, "usuario@gmail.com")
+
+        assert field.value == "usuario@gmail.com"
+        assert field.tab.sent == ["Input.insertText"]
+
+
+class TestScrollPlan:
+    """Testes para _plan_scroll"""
+
+    def test_direction_and_amount(self):
+        """Testa sinal dos deltas, quantidade de passos e faixas sorteadas"""
+        simulator = HumanBehaviorSimulator()
+        low, high = simulator.scroll_patterns['scroll_speed']
+
+        down = simulator._plan_scroll('down', 4)
+        up = simulator._plan_scroll('up', 2)
+
+        assert len(down) == 4 and len(up) == 2
+        assert all(low <= delta <= high for delta, _, _ in down)
+        assert all(-high <= delta <= -low for delta, _, _ in up)
+
+    def test_scroll_back_goes_the_other_way(self):
+        """Testa que a volta ocasional tem sentido oposto e um terço do delta"""
+        plan = instant_simulator(random_value=0)._plan_scroll('down', 3)
+
+        for delta, _, back in plan:
+            assert back == (-(delta // 3), 0)
+
+
+class TestMousePathPlan:
+    """Testes para _plan_mouse_path"""
+
+    def test_path_starts_and_ends_at_targets(self):
+        """Testa número de passos e extremos do caminho (com ruído de ±2px)"""
+        simulator = HumanBehaviorSimulator()
+
+        plan = simulator._plan_mouse_path(0, 0, 300, 400, steps=50, step_delay=0.01, distance=500)
+
+        assert len(plan) == 50
+        (x0, y0, _), (x1, y1, _) = plan[0], plan[-1]
+        assert abs(x0) <= 2 and abs(y0) <= 2
+        assert abs(x1 - 300) <= 2 and abs(y1 - 400) <= 2
+        assert all(pause >= 0.01 for _, _, pause in plan)
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,205 @@
+"""
+Testes para Login Handler
+=========================
+
+Testes unitários para os utilitários de busca e de retentativa do login.
+"""
+
+import pytest
+import asyncio
+import json
+import shutil
+import subprocess
+from unittest.mock import Mock, AsyncMock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.automation import login_handler
+from src.automation.login_handler import YouTubeLoginHandler, LoginResult, selector_text
+
+
+def make_handler(page=None):
+    """Handler com dependências falsas (sem browser, credenciais nem arquivos de log)"""
+    browser_manager = Mock()
+    browser_manager.page = page or Mock()
+    return YouTubeLoginHandler(browser_manager, Mock(), human_simulator=Mock(), logger=Mock())
+
+
+class TestSelectorText:
+    """Testes para a tradução dos pseudo-seletores de texto"""
+
+    def test_has_text(self):
+        """Testa extração do texto de :has-text("...")"""
+        assert selector_text('button:has-text("Próximo")') == "Próximo"
+
+    def test_text_equals(self):
+        """Testa extração do texto de text="..." """
+        assert selector_text('text="Senha incorreta"') == "Senha incorreta"
+
+    def test_plain_css(self):
+        """Testa que CSS puro não é tratado como texto"""
+        assert selector_text('input[type="email"]') is None
+        assert selector_text('button[aria-label*="Conta"]') is None
+
+
+class TestRaceFind:
+    """Testes para _race_find"""
+
+    @pytest.mark.asyncio
+    async def test_css_uses_select_and_text_uses_find(self):
+        """Testa despacho por tipo de seletor com timeout em segundos"""
+        element = object()
+        page = Mock()
+        page.select = AsyncMock(side_effect=asyncio.TimeoutError)
+        page.find = AsyncMock(return_value=element)
+        handler = make_handler(page)
+
+        selector, found = await handler._race_find(
+            ['input[type="email"]', 'button:has-text("Próximo")'], timeout=3
+        )
+
+        assert (selector, found) == ('button:has-text("Próximo")', element)
+        page.select.assert_awaited_once_with('input[type="email"]', timeout=3)
+        page.find.assert_awaited_once_with("Próximo", best_match=True, timeout=3)
+
+    @pytest.mark.asyncio
+    async def test_no_match(self):
+        """Testa retorno (None, None) quando nenhum seletor aparece"""
+        page = Mock()
+        page.select = AsyncMock(side_effect=asyncio.TimeoutError)
+        page.find = AsyncMock(side_effect=asyncio.TimeoutError)
+
+        assert await make_handler(page)._race_find(['div', 'text="x"'], timeout=0.1) == (None, None)
+
+
+class TestLoginStateProbe:
+    """Testes para a detecção de login por snapshot do DOM"""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_late_signin_button(self):
+        """Testa que o botão "Fazer login" renderizado depois encerra a espera como deslogado"""
+        page = Mock(url="https://www.youtube.com/")
+        page.evaluate = AsyncMock(side_effect=[None, None, 'a:has-text("Fazer login")'])
+        handler = make_handler(page)
+        handler.INDICATOR_WAIT_TIMEOUT = 5
+
+        assert await handler._probe_logged_in() is False
+        assert page.evaluate.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_short_timeout(self):
+        """Testa que sem nenhum indicador a sonda desiste em INDICATOR_WAIT_TIMEOUT segundos"""
+        page = Mock(url="https://www.youtube.com/")
+        page.evaluate = AsyncMock(return_value=None)
+        handler = make_handler(page)
+        handler.INDICATOR_WAIT_TIMEOUT = 0.3
+
+        assert await asyncio.wait_for(handler._probe_logged_in(), timeout=2) is False
+
+    @pytest.mark.asyncio
+    async def test_error_indicator_means_invalid_credentials(self):
+        """Testa que a mensagem de senha incorreta é classificada como credencial recusada"""
+        page = Mock(url="https://accounts.google.com/v3/signin/challenge/pwd")
+        page.evaluate = AsyncMock(return_value='text="Senha incorreta"')
+
+        assert await make_handler(page)._check_login_success() == LoginResult.INVALID_CREDENTIALS
+
+
+class TestAutomaticLoginSessionProbe:
+    """Testes para a sonda de sessão no início do login automático"""
+
+    def make_handler(self, logged_in: bool):
+        page = Mock(url="https://www.youtube.com/")
+        handler = make_handler(page)
+        handler.browser_manager.pre_navigation_delay = Mock(return_value=0.01)
+        handler.browser_manager.navigate_safely = AsyncMock(return_value=True)
+        handler.credential_manager.get_credentials = Mock(return_value=None)
+        handler._is_logged_in = AsyncMock(return_value=logged_in)
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_valid_session_skips_signin_page(self):
+        """Testa que sessão válida dispensa a navegação para o login"""
+        handler = self.make_handler(logged_in=True)
+
+        assert await handler._automatic_login() == LoginResult.SUCCESS
+        handler.browser_manager.navigate_safely.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_signin_navigation_starts_after_probe(self):
+        """Testa que a navegação só começa depois da sonda, sem repetir a pausa humana"""
+        handler = self.make_handler(logged_in=False)
+
+        assert await handler._automatic_login() == LoginResult.MANUAL_INTERVENTION
+        handler.browser_manager.navigate_safely.assert_awaited_once_with(
+            'https://accounts.google.com/signin', human_delay=False
+        )
+
+
+class TestRetryPolicy:
+    """Testes para backoff e classificação de resultados"""
+
+    def test_backoff_doubles_and_is_capped(self):
+        """Testa crescimento exponencial com jitter limitado e teto"""
+        handler = make_handler()
+        base, jitter = handler.RETRY_BASE_DELAY, handler.RETRY_JITTER
+
+        for attempt in range(3):
+            delay = handler._backoff_delay(attempt)
+            assert base * 2 ** attempt <= delay <= base * 2 ** attempt * (1 + jitter)
+
+        assert handler._backoff_delay(20) == handler.RETRY_MAX_DELAY
+
+    def test_only_transient_results_are_retried(self):
+        """Testa que credenciais recusadas e falhas pós-envio nunca são repetidas"""
+        assert YouTubeLoginHandler._is_recoverable(LoginResult.TIMEOUT)
+        assert YouTubeLoginHandler._is_recoverable(LoginResult.ERROR)
+        assert YouTubeLoginHandler._is_recoverable(LoginResult.CAPTCHA_REQUIRED)
+
+        assert not YouTubeLoginHandler._is_recoverable(LoginResult.INVALID_CREDENTIALS)
+        assert not YouTubeLoginHandler._is_recoverable(LoginResult.FAILED)
+        assert not YouTubeLoginHandler._is_recoverable(LoginResult.ACCOUNT_LOCKED)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node não disponível")
+class TestFirstMatchJs:
+    """Testes para o snapshot _FIRST_MATCH_JS, avaliado num DOM mínimo no node"""
+
+    DOM_STUB = """
+    const elements = {
+        "a": [{textContent: "Fazer login"}],
+        "button": [{textContent: "Próximo"}],
+    };
+    const document = {
+        body: {innerText: "Senha incorreta. Tente novamente."},
+        querySelectorAll: (s) => elements[s] || [],
+        querySelector: (s) => s === "input" ? {} : null,
+    };
+    """
+
+    def evaluate(self, selectors):
+        """Avalia o snippet com a lista de seletores e devolve o resultado"""
+        script = self.DOM_STUB + "console.log(JSON.stringify(" + \
+            (login_handler._FIRST_MATCH_JS % json.dumps(selectors)).strip() + "));"
+        output = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+        return json.loads(output.stdout)
+
+    def test_has_text(self):
+        """Testa :has-text("...") contra o texto do elemento"""
+        assert self.evaluate(['a:has-text("Sign in")', 'a:has-text("Fazer login")']) == 'a:has-text("Fazer login")'
+
+    def test_text_equals(self):
+        """Testa text="..." contra o texto da página"""
+        assert self.evaluate(['text="Wrong password"', 'text="Senha incorreta"']) == 'text="Senha incorreta"'
+
+    def test_order_and_css(self):
+        """Testa que vence o primeiro seletor presente, na ordem dada"""
+        assert self.evaluate(['div', 'input', 'button:has-text("Próximo")']) == 'input'
+        assert self.evaluate(['div', 'text="nada"']) is None
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])
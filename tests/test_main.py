@@ -0,0 +1,61 @@
+"""
+Testes para main.py
+===================
+
+Testes unitários para a limpeza de screenshots antigos.
+"""
+
+import pytest
+import os
+import time
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+main = pytest.importorskip("main")
+
+
+class TestCleanupOldScreenshots:
+    """Testes para cleanup_old_screenshots"""
+
+    @pytest.fixture
+    def shots_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(main, "SCREENSHOT_DIR", str(tmp_path))
+        return tmp_path
+
+    def make_shot(self, directory: Path, name: str, age: float) -> Path:
+        """Cria um screenshot com mtime de `age` segundos atrás"""
+        path = directory / name
+        path.write_bytes(b"png")
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_removes_stale_and_counts_remaining(self, shots_dir):
+        """Testa que só os expirados somem e o retorno conta os que restam"""
+        old = self.make_shot(shots_dir, "old.jpg", main.SCREENSHOT_LIFETIME + 60)
+        self.make_shot(shots_dir, "new1.jpg", 10)
+        self.make_shot(shots_dir, "new2.jpg", 20)
+        (shots_dir / "subdir").mkdir()
+
+        assert main.cleanup_old_screenshots() == 2
+        assert not old.exists()
+
+    def test_nothing_left_stops_timer(self, shots_dir):
+        """Testa retorno 0 quando tudo expirou (o timer não é rearmado)"""
+        self.make_shot(shots_dir, "old.jpg", main.SCREENSHOT_LIFETIME + 60)
+
+        assert main.cleanup_old_screenshots() == 0
+        assert list(shots_dir.iterdir()) == []
+
+    def test_missing_directory(self, tmp_path, monkeypatch):
+        """Testa diretório inexistente sem erro"""
+        monkeypatch.setattr(main, "SCREENSHOT_DIR", str(tmp_path / "nao_existe"))
+
+        assert main.cleanup_old_screenshots() == 0
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+"""
+Testes para main_v2.py
+======================
+
+Testes unitários para a espera do modo --keep-open.
+"""
+
+import pytest
+import asyncio
+import os
+import signal
+from unittest.mock import Mock
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main_v2
+
+
+def make_browser_manager(closed_after: float = None, reason: str = "closed"):
+    """BrowserManager falso cujo wait_until_closed termina (ou não) com `reason`"""
+    async def wait_until_closed():
+        if closed_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(closed_after)
+        return reason
+
+    manager = Mock()
+    manager.wait_until_closed = wait_until_closed
+    return manager
+
+
+class TestWaitUntilStopped:
+    """Testes para _wait_until_stopped"""
+
+    @pytest.mark.asyncio
+    async def test_returns_browser_reason(self):
+        """Testa que o motivo reportado pelo browser é devolvido"""
+        manager = make_browser_manager(closed_after=0.01, reason="session_lost")
+
+        assert await asyncio.wait_for(main_v2._wait_until_stopped(manager), timeout=2) == "session_lost"
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="add_signal_handler indisponível")
+    async def test_sigint_interrupts_and_handler_is_removed(self):
+        """Testa Ctrl+C (SIGINT) encerrando a espera e a restauração do handler"""
+        manager = make_browser_manager()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, os.kill, os.getpid(), signal.SIGINT)
+
+        assert await asyncio.wait_for(main_v2._wait_until_stopped(manager), timeout=2) == "interrupted"
+        assert loop.remove_signal_handler(signal.SIGINT) is False
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])
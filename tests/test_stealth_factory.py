@@ -0,0 +1,54 @@
+"""
+Testes para Stealth Factory
+===========================
+
+Testes unitários para a montagem das flags do browser.
+"""
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.core.stealth_factory import STEALTH_ARGS, merge_browser_args
+
+
+class TestMergeBrowserArgs:
+    """Testes para merge_browser_args"""
+
+    def test_feature_lists_are_merged(self):
+        """Testa união dos valores de --disable-features num único switch"""
+        args = merge_browser_args(
+            ["--disable-features=Translate,MediaRouter"],
+            ["--disable-features=VizDisplayCompositor,Translate"]
+        )
+
+        assert args == ["--disable-features=Translate,MediaRouter,VizDisplayCompositor"]
+
+    def test_last_value_wins_for_plain_switches(self):
+        """Testa que switches comuns repetidos ficam só com o último valor"""
+        args = merge_browser_args(
+            ["--window-size=800,600", "--mute-audio"],
+            ["--window-size=1920,1080", "--mute-audio"]
+        )
+
+        assert args == ["--window-size=1920,1080", "--mute-audio"]
+
+    def test_canonical_args_keep_shared_trim_list(self):
+        """Testa que extras do BrowserManager não descartam a lista canônica"""
+        args = merge_browser_args(STEALTH_ARGS, ["--disable-features=VizDisplayCompositor"])
+
+        features = [arg for arg in args if arg.startswith("--disable-features=")]
+        assert len(features) == 1
+        assert "Translate" in features[0]
+        assert "VizDisplayCompositor" in features[0]
+
+    def test_no_debugging_port_in_canonical_args(self):
+        """Testa que a porta de depuração fica a cargo do nodriver"""
+        assert not any(arg.startswith("--remote-debugging-port") for arg in STEALTH_ARGS)
+
+
+if __name__ == "__main__":
+    # Executa testes se chamado diretamente
+    pytest.main([__file__, "-v"])